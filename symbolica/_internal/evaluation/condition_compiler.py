@@ -0,0 +1,240 @@
+"""
+Condition Compiler
+==================
+
+Compiles simple condition expressions into a flat opcode program that is
+executed by a small stack machine, avoiding a recursive AST walk per rule
+evaluation.
+
+Only the common rule-condition subset is compiled: field/literal loads,
+single comparisons, and/or/not, unary minus and basic arithmetic. Anything
+else (function calls, subscripts, conditional expressions, chained
+comparisons, ``**``) returns ``None`` so callers fall back to CoreEvaluator.
+"""
+
+import ast
+import operator
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple, TYPE_CHECKING
+from ...core.exceptions import EvaluationError
+from ...core.config.system_config import SystemConfig
+
+if TYPE_CHECKING:
+    from ...core.models import ExecutionContext
+
+
+# Opcodes
+LOAD_FIELD = 'LOAD_FIELD'          # arg: field name
+LOAD_CONST = 'LOAD_CONST'          # arg: constant value
+COMPARE = 'COMPARE'                # arg: comparison callable
+BINARY = 'BINARY'                  # arg: arithmetic callable
+DIVIDE = 'DIVIDE'                  # arg: None (checks division by zero)
+NOT = 'NOT'                        # arg: None
+NEGATE = 'NEGATE'                  # arg: None
+POSITIVE = 'POSITIVE'              # arg: None
+BUILD_LIST = 'BUILD_LIST'          # arg: element count
+JUMP_IF_FALSE_OR_POP = 'JUMP_IF_FALSE_OR_POP'  # arg: target index
+JUMP_IF_TRUE_OR_POP = 'JUMP_IF_TRUE_OR_POP'    # arg: target index
+TO_BOOL = 'TO_BOOL'                # arg: None
+
+Program = Tuple[Tuple[str, Any], ...]
+
+LITERAL_NAMES: Dict[str, Any] = {
+    'True': True, 'true': True,
+    'False': False, 'false': False,
+    'None': None, 'null': None
+}
+
+COMPARE_OPERATORS: Dict[type, Callable[[Any, Any], Any]] = {
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.In: lambda left, right: left in right,
+    ast.NotIn: lambda left, right: left not in right,
+    ast.Is: operator.is_,
+    ast.IsNot: operator.is_not,
+}
+
+BINARY_OPERATORS: Dict[type, Callable[[Any, Any], Any]] = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Mod: operator.mod,
+}
+
+MAX_COMPILE_DEPTH = SystemConfig.MAX_RULE_DEPTH
+
+
+class _NotCompilable(Exception):
+    """Raised internally when an expression falls outside the compiled subset."""
+
+
+@lru_cache(maxsize=SystemConfig.CACHE_SIZE_LIMIT)
+def compile_condition(expression: str) -> Optional[Program]:
+    """Compile a condition expression into a flat opcode program.
+
+    Args:
+        expression: Condition expression string
+
+    Returns:
+        Tuple of (opcode, argument) pairs, or None if the expression
+        cannot be compiled and must be evaluated by walking the AST
+    """
+    try:
+        tree = ast.parse(expression.strip(), mode='eval')
+        program: List[Tuple[str, Any]] = []
+        _emit(tree.body, program, 1)
+        return tuple(program)
+    except (SyntaxError, _NotCompilable):
+        return None
+
+
+def _emit(node: ast.AST, program: List[Tuple[str, Any]], depth: int) -> None:
+    """Append opcodes for a node to the program."""
+    if depth > MAX_COMPILE_DEPTH:
+        raise _NotCompilable()  # Let the AST walker report the depth violation
+
+    node_type = type(node)
+
+    if node_type is ast.Name:
+        if node.id in LITERAL_NAMES:
+            program.append((LOAD_CONST, LITERAL_NAMES[node.id]))
+        else:
+            program.append((LOAD_FIELD, node.id))
+
+    elif node_type is ast.Constant:
+        program.append((LOAD_CONST, node.value))
+
+    elif node_type is ast.Compare:
+        if len(node.ops) != 1 or type(node.ops[0]) not in COMPARE_OPERATORS:
+            raise _NotCompilable()
+        _emit(node.left, program, depth + 1)
+        _emit(node.comparators[0], program, depth + 1)
+        program.append((COMPARE, COMPARE_OPERATORS[type(node.ops[0])]))
+
+    elif node_type is ast.BoolOp:
+        jump = JUMP_IF_FALSE_OR_POP if isinstance(node.op, ast.And) else JUMP_IF_TRUE_OR_POP
+        jump_indexes = []
+        for i, value in enumerate(node.values):
+            _emit(value, program, depth + 1)
+            if i < len(node.values) - 1:
+                jump_indexes.append(len(program))
+                program.append((jump, None))
+        # Patch jumps to land on the final bool conversion
+        for index in jump_indexes:
+            program[index] = (jump, len(program))
+        program.append((TO_BOOL, None))
+
+    elif node_type is ast.UnaryOp:
+        _emit(node.operand, program, depth + 1)
+        if isinstance(node.op, ast.Not):
+            program.append((NOT, None))
+        elif isinstance(node.op, ast.USub):
+            program.append((NEGATE, None))
+        elif isinstance(node.op, ast.UAdd):
+            program.append((POSITIVE, None))
+        else:
+            raise _NotCompilable()
+
+    elif node_type is ast.BinOp:
+        op_type = type(node.op)
+        if op_type is not ast.Div and op_type not in BINARY_OPERATORS:
+            raise _NotCompilable()  # Pow and friends stay under the timeout guard
+        _emit(node.left, program, depth + 1)
+        _emit(node.right, program, depth + 1)
+        if op_type is ast.Div:
+            program.append((DIVIDE, None))
+        else:
+            program.append((BINARY, BINARY_OPERATORS[op_type]))
+
+    elif node_type is ast.List:
+        for element in node.elts:
+            _emit(element, program, depth + 1)
+        program.append((BUILD_LIST, len(node.elts)))
+
+    else:
+        raise _NotCompilable()
+
+
+def run_condition(program: Program, context: 'ExecutionContext') -> Tuple[Any, Dict[str, Any]]:
+    """Execute a compiled program against a context.
+
+    Args:
+        program: Program produced by compile_condition
+        context: Execution context providing field values
+
+    Returns:
+        Tuple of (result, field_values) matching CoreEvaluator.evaluate
+
+    Raises:
+        EvaluationError: On type errors or division by zero
+    """
+    stack: List[Any] = []
+    push = stack.append
+    pop = stack.pop
+    field_values: Dict[str, Any] = {}
+    pc = 0
+    end = len(program)
+
+    while pc < end:
+        op, arg = program[pc]
+        pc += 1
+
+        if op is LOAD_FIELD:
+            value = context.get_fact(arg, None)
+            field_values[arg] = value
+            push(value)
+        elif op is LOAD_CONST:
+            push(arg)
+        elif op is COMPARE:
+            right = pop()
+            try:
+                stack[-1] = arg(stack[-1], right)
+            except TypeError as e:
+                raise EvaluationError(f"Type error in comparison: {e}")
+        elif op is JUMP_IF_FALSE_OR_POP:
+            if not stack[-1]:
+                pc = arg
+            else:
+                pop()
+        elif op is JUMP_IF_TRUE_OR_POP:
+            if stack[-1]:
+                pc = arg
+            else:
+                pop()
+        elif op is TO_BOOL:
+            stack[-1] = bool(stack[-1])
+        elif op is NOT:
+            stack[-1] = not stack[-1]
+        elif op is BINARY:
+            right = pop()
+            try:
+                stack[-1] = arg(stack[-1], right)
+            except TypeError as e:
+                raise EvaluationError(f"Type error in arithmetic: {e}")
+            except ZeroDivisionError:
+                raise EvaluationError("Division by zero")
+        elif op is DIVIDE:
+            right = pop()
+            if right == 0:
+                raise EvaluationError("Division by zero")
+            try:
+                stack[-1] = stack[-1] / right
+            except TypeError as e:
+                raise EvaluationError(f"Type error in arithmetic: {e}")
+        elif op is NEGATE:
+            stack[-1] = -stack[-1]
+        elif op is POSITIVE:
+            stack[-1] = +stack[-1]
+        elif op is BUILD_LIST:
+            if arg:
+                items = stack[-arg:]
+                del stack[-arg:]
+            else:
+                items = []
+            push(items)
+
+    return stack[-1], field_values
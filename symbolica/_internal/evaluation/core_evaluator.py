@@ -11,10 +11,11 @@ import ast
 import signal
 from contextlib import contextmanager
 from functools import lru_cache
-from typing import Any, Dict, Tuple, Callable, TYPE_CHECKING, Set, Type, Optional
+from typing import Any, Dict, FrozenSet, Tuple, Callable, TYPE_CHECKING, Set, Type, Optional
 from ...core.exceptions import EvaluationError, FunctionError, SecurityError
 from ...core.config.system_config import SystemConfig
 from .builtin_functions import get_builtin_functions
+from .condition_compiler import compile_condition, run_condition
 
 if TYPE_CHECKING:
     from ...core.models import ExecutionContext
@@ -44,6 +45,12 @@ SAFE_NODE_TYPES: Set[Type[ast.AST]] = {
     ast.Load, ast.Store, ast.Del
 }
 
+# Built-ins that must never be called from a condition, registered or not
+BLOCKED_CALL_NAMES: FrozenSet[str] = frozenset({
+    'eval', 'exec', 'compile', 'open', 'input', 'globals', 'locals', 'vars',
+    'getattr', 'setattr', 'delattr', 'breakpoint', '__import__'
+})
+
 # Use configuration for all limits
 MAX_EVALUATION_TIME = SystemConfig.DEFAULT_TIMEOUT_SECONDS
 MAX_RECURSION_DEPTH = SystemConfig.MAX_RULE_DEPTH  
@@ -51,6 +58,21 @@ EXPRESSION_CACHE_SIZE = SystemConfig.CACHE_SIZE_LIMIT
 MAX_EXPRESSION_LENGTH = SystemConfig.MAX_CONDITION_LENGTH
 
 
+def validate_expression(expression: str) -> ast.AST:
+    """Statically validate a condition expression without evaluating it.
+    
+    Applies the length limit, parses the expression and checks it against
+    the AST security rules. Results are cached per expression string.
+    
+    Raises:
+        SecurityError: If the expression is too long or uses unsafe constructs
+        EvaluationError: If the expression has invalid syntax
+    """
+    if len(expression.strip()) > MAX_EXPRESSION_LENGTH:
+        raise SecurityError(f"Expression too long (max {MAX_EXPRESSION_LENGTH} characters)")
+    return _parse_and_validate_expression(expression)
+
+
 @lru_cache(maxsize=EXPRESSION_CACHE_SIZE)
 def _parse_and_validate_expression(expression: str) -> ast.AST:
     """Parse and validate expression with caching."""
@@ -69,8 +91,13 @@ def _parse_and_validate_expression(expression: str) -> ast.AST:
 def _validate_ast_security_static(tree: ast.AST) -> None:
     """Static version of AST security validation for caching."""
     for node in ast.walk(tree):
-        if type(node) not in SAFE_NODE_TYPES:
-            raise SecurityError(f"Unsafe AST node type: {type(node).__name__}")
+        node_type = type(node)
+        if node_type not in SAFE_NODE_TYPES:
+            raise SecurityError(f"Unsafe AST node type: {node_type.__name__}")
+        if node_type is ast.Name and node.id.startswith('__'):
+            raise SecurityError(f"Access to dunder name '{node.id}' is not allowed")
+        if node_type is ast.Call and isinstance(node.func, ast.Name) and node.func.id in BLOCKED_CALL_NAMES:
+            raise SecurityError(f"Call to '{node.func.id}' is not allowed")
 
 
 @contextmanager
@@ -112,12 +139,14 @@ class CoreEvaluator:
     def evaluate(self, condition_expr: str, context: 'ExecutionContext') -> Tuple[Any, Dict[str, Any]]:
         """Evaluate condition expression and return result with field values."""
         try:
-            # Basic input validation
-            if len(condition_expr.strip()) > MAX_EXPRESSION_LENGTH:
-                raise SecurityError(f"Expression too long (max {MAX_EXPRESSION_LENGTH} characters)")
+            # Length check, parse and AST security validation (with caching)
+            tree = validate_expression(condition_expr)
             
-            # Parse and validate AST (with caching)
-            tree = _parse_and_validate_expression(condition_expr)
+            # Fast path: simple conditions run as a flat compiled program.
+            # The compiled subset has no calls or '**', so it needs no timeout.
+            program = compile_condition(condition_expr)
+            if program is not None:
+                return run_condition(program, context)
             
             # Evaluate with timeout protection
             with evaluation_timeout(MAX_EVALUATION_TIME):
@@ -7,7 +7,8 @@ Designed for production monitoring, alerting, and session management.
 """
 
 import time
-from typing import Dict, List, Tuple, Any, Optional, Callable
+from contextlib import contextmanager
+from typing import Dict, List, Tuple, Any, Optional, Callable, Sequence, Iterator
 from collections import deque
 from dataclasses import dataclass
 import threading
@@ -57,6 +58,9 @@ class TemporalStore:
         
         # Thread safety
         self._lock = threading.RLock()
+        
+        # Per-thread "now" pinned by frozen_time() for read queries
+        self._clock = threading.local()
     
     def store_datapoint(self, key: str, value: float, timestamp: Optional[float] = None) -> None:
         """
@@ -82,6 +86,65 @@ class TemporalStore:
             # Trigger cleanup if needed
             self._maybe_cleanup()
     
+    def store_datapoints(self, key: str, values: Sequence[float],
+                         timestamps: Optional[Sequence[float]] = None) -> None:
+        """
+        Store several time-series data points for one key in a single call.
+        
+        Equivalent to calling store_datapoint() for each value in order, but
+        takes the lock and checks for cleanup once for the whole batch.
+        
+        Args:
+            key: Time-series key (e.g., 'cpu_utilization', 'error_rate')
+            values: Numeric values to store, oldest first
+            timestamps: Optional timestamps matching values one-to-one
+                (defaults to the current time for every value)
+        """
+        if timestamps is None:
+            now = time.time()
+            points = [TimeSeriesPoint(now, value) for value in values]
+        else:
+            if len(timestamps) != len(values):
+                raise ValueError(
+                    f"Got {len(values)} values but {len(timestamps)} timestamps for '{key}'"
+                )
+            points = [TimeSeriesPoint(timestamp, value)
+                      for timestamp, value in zip(timestamps, values)]
+        
+        with self._lock:
+            # Initialize deque if needed
+            if key not in self._timeseries:
+                self._timeseries[key] = deque(maxlen=self._max_points)
+            
+            self._timeseries[key].extend(points)
+            
+            # Trigger cleanup if needed
+            self._maybe_cleanup()
+    
+    @contextmanager
+    def frozen_time(self, now: Optional[float] = None) -> Iterator[float]:
+        """
+        Pin the current time seen by window and TTL queries on this thread.
+        
+        Queries made inside the block all use the same "now", so predicates
+        evaluated together agree on window boundaries and the clock is read
+        once. Writes keep using the real clock.
+        
+        Args:
+            now: Timestamp to pin (defaults to the current time)
+        """
+        previous = getattr(self._clock, 'now', None)
+        self._clock.now = time.time() if now is None else now
+        try:
+            yield self._clock.now
+        finally:
+            self._clock.now = previous
+    
+    def _now(self) -> float:
+        """Current time for queries, honouring frozen_time()."""
+        now = getattr(self._clock, 'now', None)
+        return time.time() if now is None else now
+    
     def get_window_data(self, key: str, duration_seconds: int) -> List[TimeSeriesPoint]:
         """
         Get all data points within the specified time window.
@@ -93,7 +156,7 @@ class TemporalStore:
         Returns:
             List of TimeSeriesPoint within the window
         """
-        cutoff_time = time.time() - duration_seconds
+        cutoff_time = self._now() - duration_seconds
         
         with self._lock:
             if key not in self._timeseries:
@@ -152,8 +215,9 @@ class TemporalStore:
             
         # More lenient check - just need reasonable coverage
         earliest_time = min(p.timestamp for p in points)
-        required_time = time.time() - duration_seconds
-        coverage_ratio = (time.time() - earliest_time) / duration_seconds
+        now = self._now()
+        required_time = now - duration_seconds
+        coverage_ratio = (now - earliest_time) / duration_seconds
         
         if coverage_ratio < 0.8:  # Need at least 80% coverage
             return False
@@ -196,7 +260,7 @@ class TemporalStore:
             value, expires_at = self._ttl_facts[key]
             
             # Check expiration
-            if time.time() > expires_at:
+            if self._now() > expires_at:
                 # Expired - remove and return None
                 del self._ttl_facts[key]
                 return None
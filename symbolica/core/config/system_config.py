@@ -42,6 +42,7 @@ class SystemConfig:
     DEFAULT_ENCODING: str = 'utf-8'
     YAML_FILE_EXTENSIONS: tuple = ('.yaml', '.yml')
     MAX_FILE_SIZE_MB: int = 10  # Maximum YAML file size
+    RULE_CACHE_DIR: str = '~/.cache/symbolica'  # Compiled rule-set cache location
     
     # Logging Configuration
     DEFAULT_LOG_LEVEL: str = 'INFO'
@@ -6,26 +6,89 @@ Simple, deterministic rule engine for AI agent decision-making.
 Refactored to use focused components following Single Responsibility Principle.
 """
 
+import copy
 import time
 import logging
 import re
+import threading
+from collections import OrderedDict
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any, List, Optional, Union, Callable
+from typing import Dict, Any, List, Optional, Sequence, Tuple, Union, Callable
 
 from .models import Rule, Facts, ExecutionContext, ExecutionResult, Goal, facts
 from .exceptions import (
     ValidationError, ExecutionError, EvaluationError, 
     DAGError, ConfigurationError, ErrorCollector, FunctionError
 )
+from .config.system_config import SystemConfig
 from .services.loader import RuleLoader
 from .services.function_registry import FunctionRegistry
 from .validation.validation_service import ValidationService
 from .services.temporal_service import TemporalService
 from .._internal.evaluation.evaluator import ASTEvaluator
+from .._internal.evaluation.core_evaluator import validate_expression
 from .._internal.strategies.dag import DAGStrategy
 from .._internal.strategies.backward_chainer import BackwardChainer
 
 
+# Action value markers used by Engine._is_expression: arithmetic/comparison
+# operators or a function call, and literals (URLs, UNC paths) to leave alone
+_EXPRESSION_MARKERS = re.compile(r'[-+*/%<>]|==|!=|\w\s*\(')
+_LITERAL_MARKERS = re.compile(r'https?://|\\\\|\.com|\.org', re.IGNORECASE)
+
+# {{ expression }} placeholders in template action values (non-greedy)
+_TEMPLATE_PATTERN = re.compile(r'\{\{\s*(.*?)\s*\}\}')
+
+
+@lru_cache(maxsize=SystemConfig.CACHE_SIZE_LIMIT)
+def _looks_like_expression(value: str) -> bool:
+    """Classify a non-empty action value string; see Engine._is_expression."""
+    # URLs and paths are literals even though they contain operators
+    if _LITERAL_MARKERS.search(value):
+        return False
+    
+    # Operators, comparisons and function calls; parentheses and templates
+    # only count as a matched pair
+    return bool(
+        _EXPRESSION_MARKERS.search(value) or
+        ('(' in value and ')' in value) or
+        ('{{' in value and '}}' in value)
+    )
+
+
+@lru_cache(maxsize=SystemConfig.CACHE_SIZE_LIMIT)
+def _is_valid_expression(expression: str) -> bool:
+    """Check an expression against static parsing and security validation.
+    
+    The outcome depends only on the text, so caching failures lets action
+    values that can never evaluate skip the raise-and-catch fallback.
+    """
+    try:
+        validate_expression(expression)
+        return True
+    except (EvaluationError, SyntaxError):  # SecurityError is an EvaluationError
+        return False
+
+
+@lru_cache(maxsize=SystemConfig.CACHE_SIZE_LIMIT)
+def _parse_template(template: str) -> Tuple[Tuple[int, int, str], ...]:
+    """Locate template placeholders as (start, end, expression) spans."""
+    return tuple(
+        (match.start(), match.end(), match.group(1).strip())
+        for match in _TEMPLATE_PATTERN.finditer(template)
+    )
+
+# Distinct fact sets remembered by Engine.reason_cached
+REASON_CACHE_SIZE = 256
+
+# (key, raw value, is_expression) triples for a rule's facts or actions, in order
+ActionPlan = Tuple[Tuple[str, Any, bool], ...]
+
+# Per-thread memo of the last from_yaml() input and its schema-validated data
+_last_from_yaml = threading.local()
+
+
 class Engine:
     """Simple rule engine for AI agents.
     
@@ -57,6 +120,9 @@ class Engine:
         
         # Initialize core components
         self._rules = rules or []
+        self._rule_action_plans: Dict[str, Tuple[Rule, Tuple[ActionPlan, ActionPlan]]] = {}
+        # Fact-set key -> result for reason_cached(), least recently used first
+        self._reason_cache: 'OrderedDict[frozenset, ExecutionResult]' = OrderedDict()
         self._function_registry = FunctionRegistry()
         self._validation_service = ValidationService()
         self._rule_loader = RuleLoader()
@@ -135,68 +201,9 @@ class Engine:
         Returns:
             True if value appears to be an expression, False otherwise
         """
-        if not isinstance(value, str):
-            return False
-        
-        # Skip empty strings
-        if not value.strip():
-            return False
-        
-        # Check for arithmetic operators
-        arithmetic_ops = ['+', '-', '*', '/', '//', '%', '**']
-        has_arithmetic = any(op in value for op in arithmetic_ops)
-        
-        # Check for parentheses (likely mathematical expression)
-        has_parentheses = '(' in value and ')' in value
-        
-        # Check for function calls (word followed by parentheses)
-        has_function_call = re.search(r'\w+\s*\(', value)
-        
-        # Check for comparison operators 
-        comparison_ops = ['==', '!=', '<', '>', '<=', '>=']
-        has_comparisons = any(op in value for op in comparison_ops)
-        
-        # Check for template variables ({{ variable }})
-        has_templates = '{{' in value and '}}' in value
-        
-        # Check for boolean/logical operators, but be more careful about context
-        # Only consider it logical if it's combined with other expression indicators
-        logical_ops = [' and ', ' or ', ' not ', ' in ', ' is ']
-        has_logical_words = any(op in value for op in logical_ops)
-        
-        # More restrictive logical check: must have logical words AND other expression indicators
-        # This prevents simple sentences like "Good credit and sufficient income" from being treated as expressions
-        has_logical = has_logical_words and (has_arithmetic or has_parentheses or has_function_call or has_comparisons or has_templates)
-        
-        # Only treat as expression if it has clear expression indicators
-        # Do NOT treat single words or simple sentences as expressions
-        is_likely_expression = (
-            has_arithmetic or 
-            has_parentheses or 
-            has_function_call or
-            has_comparisons or
-            has_templates or
-            has_logical
-        )
-        
-        # Additional checks to avoid false positives
-        # Skip if it's clearly a sentence (multiple words with spaces and no operators)
-        # BUT don't exclude template expressions even if they have spaces
-        if (' ' in value and 
-            not any(op in value for op in arithmetic_ops + comparison_ops) and 
-            not has_parentheses and 
-            not has_templates and
-            not has_function_call and
-            not has_logical):  # Updated to use the more restrictive has_logical
+        if not isinstance(value, str) or not value.strip():
             return False
-        
-        # Skip if it looks like a URL, file path, or other string literal
-        # Don't exclude template expressions or arithmetic expressions
-        if (any(pattern in value.lower() for pattern in ['http://', 'https://', '\\\\', '.com', '.org']) or 
-            ('/' in value and not has_templates and not has_arithmetic and ' ' not in value)):
-            return False
-        
-        return is_likely_expression
+        return _looks_like_expression(value)
     
     def _evaluate_action_value(self, value: Any, context: ExecutionContext) -> Any:
         """Evaluate an action value, handling both templates and expressions.
@@ -211,7 +218,14 @@ class Engine:
         # Only attempt evaluation for potential expressions
         if not self._is_expression(value):
             return value
+        return self._evaluate_expression_value(value, context)
+    
+    def _evaluate_expression_value(self, value: Any, context: ExecutionContext) -> Any:
+        """Evaluate an action value already classified as an expression or template.
         
+        Returns:
+            Computed value, or the original value if evaluation fails
+        """
         try:
             value_str = str(value)
             
@@ -221,6 +235,8 @@ class Engine:
             
             # Handle direct expressions (arithmetic, comparisons, function calls)
             else:
+                if not _is_valid_expression(value_str):
+                    return value  # Known not to evaluate, e.g. "A+" or "100%"
                 result, _ = self._evaluator._core.evaluate(value_str, context)
                 return result
                 
@@ -229,6 +245,23 @@ class Engine:
             # This ensures backward compatibility
             return value
     
+    def _action_plans(self, rule: Rule) -> Tuple[ActionPlan, ActionPlan]:
+        """Get a rule's facts and actions classified once into literals and expressions.
+        
+        Plans are cached per rule object, so firing a rule again skips
+        expression detection and literal values are applied as-is.
+        """
+        cached = self._rule_action_plans.get(rule.id)
+        if cached is not None and cached[0] is rule:
+            return cached[1]
+        
+        plans = (
+            tuple((key, value, self._is_expression(value)) for key, value in rule.facts.items()),
+            tuple((key, value, self._is_expression(value)) for key, value in rule.actions.items())
+        )
+        self._rule_action_plans[rule.id] = (rule, plans)
+        return plans
+    
     def _evaluate_template_expression(self, template: str, context: ExecutionContext) -> Any:
         """Evaluate template expressions with variable substitution.
         
@@ -239,50 +272,79 @@ class Engine:
         Returns:
             Evaluated template result
         """
-        import re
-        
-        # Pattern to match {{ expression }} - use non-greedy match to handle nested braces
-        template_pattern = r'\{\{\s*(.*?)\s*\}\}'
+        # Placeholder spans are parsed once per distinct template
+        spans = _parse_template(template)
         
-        # Find all template expressions
-        matches = list(re.finditer(template_pattern, template))
-        
-        if not matches:
+        if not spans:
             # No template expressions found, return as-is
             return template
         
         # If the entire string is a single template expression, evaluate and return the result
-        if len(matches) == 1 and matches[0].group(0).strip() == template.strip():
-            expression = matches[0].group(1).strip()
-            try:
-                # Use the core evaluator which properly handles PROMPT function
-                result, _ = self._evaluator._core.evaluate(expression, context)
-                return result
-            except Exception:
-                # If evaluation fails, return the expression itself
-                return expression
+        if len(spans) == 1:
+            start, end, expression = spans[0]
+            if template[start:end].strip() == template.strip():
+                if not _is_valid_expression(expression):
+                    return expression
+                try:
+                    # Use the core evaluator which properly handles PROMPT function
+                    result, _ = self._evaluator._core.evaluate(expression, context)
+                    return result
+                except Exception:
+                    # If evaluation fails, return the expression itself
+                    return expression
         
         # Multiple templates or mixed content - perform string substitution
         result = template
-        for match in reversed(matches):  # Process in reverse to maintain positions
-            expression = match.group(1).strip()
+        for start, end, expression in reversed(spans):  # Process in reverse to maintain positions
+            if not _is_valid_expression(expression):
+                result = result[:start] + expression + result[end:]
+                continue
             try:
                 # Use the core evaluator which properly handles PROMPT function
                 eval_result, _ = self._evaluator._core.evaluate(expression, context)
                 # Convert result to string for substitution
-                result = result[:match.start()] + str(eval_result) + result[match.end():]
+                result = result[:start] + str(eval_result) + result[end:]
             except Exception:
                 # If evaluation fails, substitute with the expression itself
-                result = result[:match.start()] + expression + result[match.end():]
+                result = result[:start] + expression + result[end:]
         
         return result
     
     # Rule Loading Methods (delegated to RuleLoader)
     @classmethod
     def from_yaml(cls, yaml_content: str, **kwargs) -> 'Engine':
-        """Create engine from YAML string."""
+        """Create engine from YAML string.
+        
+        Repeating the previous call's YAML on the same thread reuses its parsed,
+        schema-validated data, skipping YAML parsing and schema validation.
+        Rules are still built fresh from a private copy of that data, so
+        engines never share Rule objects or their containers.
+        """
+        loader = RuleLoader()
+        last_yaml = getattr(_last_from_yaml, 'yaml_content', None)
+        if yaml_content is last_yaml or yaml_content == last_yaml:
+            return cls(loader._parse_rules_data(copy.deepcopy(_last_from_yaml.data)), **kwargs)
+        
+        data = loader.validate_yaml_schema(yaml_content)
+        rules = loader._parse_rules_data(data)
+        # Copied before anyone can mutate the rules built from data
+        _last_from_yaml.data = copy.deepcopy(data)
+        _last_from_yaml.yaml_content = yaml_content
+        return cls(rules, **kwargs)
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], **kwargs) -> 'Engine':
+        """Create engine from already-parsed rule data (a dict with a 'rules' list)."""
+        loader = RuleLoader()
+        rules = loader.from_dict(data)
+        return cls(rules, **kwargs)
+    
+    @classmethod
+    def from_yaml_cached(cls, yaml_content: str, cache_dir: Optional[Union[str, Path]] = None,
+                         **kwargs) -> 'Engine':
+        """Create engine from YAML string, using an on-disk cache of parsed rules."""
         loader = RuleLoader()
-        rules = loader.from_yaml(yaml_content)
+        rules = loader.from_yaml_cached(yaml_content, cache_dir)
         return cls(rules, **kwargs)
     
     @classmethod
@@ -299,6 +361,20 @@ class Engine:
         rules = loader.from_directory(directory_path)
         return cls(rules, **kwargs)
     
+    # Condition Validation
+    @staticmethod
+    def validate_condition(condition: str) -> None:
+        """Statically check a condition expression without building an engine.
+        
+        Runs the same length, syntax and AST security checks applied before
+        evaluation; results are cached per expression.
+        
+        Raises:
+            SecurityError: If the condition is too long or uses unsafe constructs
+            EvaluationError: If the condition has invalid syntax
+        """
+        validate_expression(condition)
+    
     # Function Management (delegated to FunctionRegistry)
     def register_function(self, name: str, func: Callable, allow_unsafe: bool = False) -> None:
         """Register a custom function for use in rule conditions.
@@ -316,6 +392,7 @@ class Engine:
         self._evaluator._execution_path_evaluator.register_function(name, func)
         # Update field extractor
         self._evaluator._update_function_registry()
+        self._reason_cache.clear()
     
     def unregister_function(self, name: str) -> None:
         """Remove a registered custom function."""
@@ -326,6 +403,7 @@ class Engine:
         self._evaluator._execution_path_evaluator.unregister_function(name)
         # Update field extractor
         self._evaluator._update_function_registry()
+        self._reason_cache.clear()
     
     def list_functions(self) -> Dict[str, str]:
         """List all available functions (built-in + custom + temporal + LLM)."""
@@ -340,10 +418,18 @@ class Engine:
     def store_datapoint(self, key: str, value: float, timestamp: Optional[float] = None) -> None:
         """Store a time-series data point for use in temporal functions."""
         self._temporal_service.store_datapoint(key, value, timestamp)
+        self._reason_cache.clear()
+    
+    def store_datapoints(self, key: str, values: Sequence[float],
+                         timestamps: Optional[Sequence[float]] = None) -> None:
+        """Store a batch of time-series data points for one key."""
+        self._temporal_service.store_datapoints(key, values, timestamps)
+        self._reason_cache.clear()
     
     def set_ttl_fact(self, key: str, value: Any, ttl_seconds: int) -> None:
         """Set a fact with time-to-live (TTL)."""
         self._temporal_service.set_ttl_fact(key, value, ttl_seconds)
+        self._reason_cache.clear()
     
     def get_temporal_stats(self) -> Dict[str, Any]:
         """Get temporal store statistics."""
@@ -351,6 +437,7 @@ class Engine:
     
     def cleanup_temporal_data(self) -> Dict[str, int]:
         """Force cleanup of old temporal data."""
+        self._reason_cache.clear()
         return self._temporal_service.cleanup_old_data()
     
     # Core Execution Logic (simplified and focused)  
@@ -369,8 +456,10 @@ class Engine:
             fired_rules=[]
         )
         
-        # Execute rules iteratively until convergence
-        self._execute_rules_iteratively(context)
+        # Execute rules iteratively until convergence; temporal functions
+        # share one "now" so windows line up across the whole evaluation
+        with self._temporal_service.frozen_time():
+            self._execute_rules_iteratively(context)
         
         # Build result with context for hierarchical tracing
         execution_time_ms = (time.perf_counter() - start_time) * 1000
@@ -383,6 +472,36 @@ class Engine:
             _context=context  # Store context for rich tracing access
         )
     
+    def reason_cached(self, input_facts: Union[Facts, Dict[str, Any]]) -> ExecutionResult:
+        """Execute rules like reason(), reusing the result for a repeated fact set.
+        
+        Results are cached per engine, keyed on the fact items, and cleared
+        whenever rules, functions or temporal data change. Only use this when
+        rule outcomes depend on the facts alone: time-windowed temporal
+        functions, PROMPT() and impure custom functions can change the result
+        between calls. Facts with unhashable values (lists, dicts) are always
+        evaluated directly. Cached results are shared, so treat them as
+        read-only.
+        """
+        data = input_facts.data if isinstance(input_facts, Facts) else input_facts
+        try:
+            # The value's type is part of the key: 1, 1.0 and True compare
+            # and hash equal but can lead rules to different verdicts
+            key = frozenset((k, type(v), v) for k, v in data.items())
+            result = self._reason_cache.get(key)
+        except TypeError:
+            return self.reason(input_facts)  # Unhashable fact values
+        
+        if result is not None:
+            self._reason_cache.move_to_end(key)
+            return result
+        
+        result = self.reason(input_facts)
+        self._reason_cache[key] = result
+        if len(self._reason_cache) > REASON_CACHE_SIZE:
+            self._reason_cache.popitem(last=False)
+        return result
+    
     def _execute_rules_iteratively(self, context: ExecutionContext) -> None:
         """Execute rules iteratively until no new rules fire (convergence)."""
         
@@ -466,20 +585,21 @@ class Engine:
                 detailed_reason = trace.explain()
             
             if trace_result:
+                fact_plan, action_plan = self._action_plans(rule)
+                
                 # Apply facts first (intermediate state available to other rules)
                 evaluated_facts = {}
-                if rule.facts:
-                    for key, value in rule.facts.items():
-                        # Evaluate expressions, keep literals as-is
-                        evaluated_value = self._evaluate_action_value(value, context)
-                        context.set_intermediate_fact(key, evaluated_value)
-                        evaluated_facts[key] = evaluated_value
+                for key, value, is_expression in fact_plan:
+                    # Evaluate expressions, keep literals as-is
+                    evaluated_value = self._evaluate_expression_value(value, context) if is_expression else value
+                    context.set_intermediate_fact(key, evaluated_value)
+                    evaluated_facts[key] = evaluated_value
                 
-                # Apply actions (final outputs)
+                # Apply actions (final outputs) in order, so later actions see earlier ones
                 evaluated_actions = {}
-                for key, value in rule.actions.items():
+                for key, value, is_expression in action_plan:
                     # Evaluate expressions, keep literals as-is
-                    evaluated_value = self._evaluate_action_value(value, context)
+                    evaluated_value = self._evaluate_expression_value(value, context) if is_expression else value
                     context.set_fact(key, evaluated_value, rule.priority, rule.id)
                     evaluated_actions[key] = evaluated_value
                 
@@ -568,6 +688,7 @@ class Engine:
         
         # Update backward chainer
         self._backward_chainer = BackwardChainer(self._rules, self._evaluator)
+        self._reason_cache.clear()
     
     def remove_rule(self, rule_id: str) -> bool:
         """Remove a rule by ID.
@@ -586,6 +707,7 @@ class Engine:
             self._validation_service.validate_rules(self._rules)
             # Update backward chainer
             self._backward_chainer = BackwardChainer(self._rules, self._evaluator)
+            self._reason_cache.clear()
             return True
         
         return False
@@ -633,6 +755,7 @@ class Engine:
         
         # Update backward chainer
         self._backward_chainer = BackwardChainer(self._rules, self._evaluator)
+        self._reason_cache.clear()
         
         return True
     
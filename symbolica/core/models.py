@@ -8,10 +8,15 @@ Optimized for deterministic execution and LLM explainability.
 
 from dataclasses import dataclass, field
 from typing import Dict, Any, List, Optional
+import sys
 import time
 
 
-@dataclass(frozen=True)
+# Slotted dataclasses drop the per-instance __dict__; only available on 3.10+
+_SLOTS: Dict[str, Any] = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(frozen=True, **_SLOTS)
 class Rule:
     """Simple rule definition for AI agents."""
     id: str
@@ -27,6 +32,8 @@ class Rule:
     def __post_init__(self):
         if not self.id or not isinstance(self.id, str):
             raise ValueError("Rule ID must be a non-empty string")
+        # Rule IDs are compared and hashed constantly during execution
+        object.__setattr__(self, 'id', sys.intern(self.id))
         if not isinstance(self.priority, int):
             raise ValueError("Priority must be an integer")
         if not self.condition or not isinstance(self.condition, str):
@@ -45,7 +52,7 @@ class Rule:
             raise ValueError("Enabled must be a boolean")
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, **_SLOTS)
 class Facts:
     """Immutable facts container."""
     data: Dict[str, Any]
@@ -65,7 +72,7 @@ class Facts:
         return self.data[key]
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, **_SLOTS)
 class ExecutionResult:
     """Result of rule execution for AI agents with simple explainability."""
     verdict: Dict[str, Any]  # Final computed facts
@@ -183,7 +190,7 @@ class ExecutionResult:
         return self.get_priority_reasoning()
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, **_SLOTS)
 class Goal:
     """Goal for backward chaining - what we want to achieve."""
     target_facts: Dict[str, Any]
@@ -197,7 +204,7 @@ class Goal:
 
 def facts(**kwargs) -> Facts:
     """Factory function for creating Facts."""
-    return Facts(kwargs)
+    return Facts({sys.intern(key): value for key, value in kwargs.items()})
 
 
 def goal(**kwargs) -> Goal:
@@ -205,7 +212,7 @@ def goal(**kwargs) -> Goal:
     return Goal(kwargs)
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class ExecutionContext:
     """Mutable execution context during rule processing."""
     original_facts: Facts
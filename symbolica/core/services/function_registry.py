@@ -9,6 +9,7 @@ Separated from Engine to follow Single Responsibility Principle.
 from typing import Dict, Callable, Any, List
 from ..exceptions import ValidationError
 from ..validation.identifier_validator import IdentifierValidator
+from ..._internal.evaluation.core_evaluator import BLOCKED_CALL_NAMES
 
 
 class FunctionRegistry:
@@ -56,6 +57,11 @@ class FunctionRegistry:
         # Use identifier validator for consistent validation (including reserved keywords)
         self._identifier_validator.validate_identifier(name, f"Function name '{name}'")
         
+        # Conditions calling these names are rejected before evaluation, so a
+        # registration under one of them could never be used
+        if name in BLOCKED_CALL_NAMES or name.startswith('__'):
+            raise ValidationError(f"Function name '{name}' is blocked in rule conditions")
+        
         # Safety checks for user functions
         if not allow_unsafe:
             if not self._is_lambda(func):
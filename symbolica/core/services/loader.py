@@ -6,13 +6,45 @@ Handles loading and parsing of rules from various sources.
 Separated from Engine to follow Single Responsibility Principle.
 """
 
+import hashlib
+import json
+import logging
+import os
+import sys
 import yaml
+from dataclasses import asdict
 from pathlib import Path
-from typing import Dict, Any, List, Union
+from typing import Dict, Any, List, Optional, Union
 
 from ..models import Rule
 from ..exceptions import ValidationError
 from ..validation.schema_validator import SchemaValidator
+from ..config.system_config import SystemConfig
+
+
+# libyaml-backed loader when PyYAML was built with it; same safe semantics
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+# Bump when the on-disk rule cache layout changes
+RULE_CACHE_VERSION = 1
+
+# String action values shorter than this length are interned (enum-like literals)
+MAX_INTERNED_VALUE_LENGTH = 32
+
+
+def _package_version() -> str:
+    """Version of the installed symbolica package, recorded in rule cache entries."""
+    from ... import __version__  # Deferred: the package imports this module
+    return __version__
+
+
+def _intern_mapping(mapping: Dict[str, Any]) -> Dict[str, Any]:
+    """Intern keys and short string values of an actions/facts mapping."""
+    return {
+        (sys.intern(key) if isinstance(key, str) else key):
+        (sys.intern(value) if isinstance(value, str) and len(value) < MAX_INTERNED_VALUE_LENGTH else value)
+        for key, value in mapping.items()
+    }
 
 
 class ConditionParser:
@@ -82,6 +114,73 @@ class RuleLoader:
         """Create rules from YAML string with schema validation."""
         return self._parse_yaml_rules(yaml_content)
     
+    def from_yaml_cached(self, yaml_content: str,
+                         cache_dir: Optional[Union[str, Path]] = None) -> List[Rule]:
+        """Create rules from YAML string, reusing a JSON cache of the parsed rules.
+        
+        The cache is keyed by a hash of the YAML text, so a hit skips YAML parsing
+        and schema validation entirely. Entries written by another symbolica
+        version are re-parsed, so upgrades never serve rules that skipped newer
+        validation. Rule sets that do not survive a JSON round-trip unchanged
+        (e.g. YAML dates) are never cached.
+        
+        Args:
+            yaml_content: YAML content string
+            cache_dir: Cache directory (defaults to SystemConfig.RULE_CACHE_DIR)
+            
+        Returns:
+            List of parsed rules
+        """
+        cache_path = self._cache_path(yaml_content, cache_dir)
+        
+        try:
+            with open(cache_path, 'r', encoding=SystemConfig.DEFAULT_ENCODING) as f:
+                cached = json.load(f)
+            if (cached.get('version') == RULE_CACHE_VERSION
+                    and cached.get('symbolica_version') == _package_version()):
+                return [
+                    Rule(**{**rule_data,
+                            'facts': _intern_mapping(rule_data['facts']),
+                            'actions': _intern_mapping(rule_data['actions'])})
+                    for rule_data in cached['rules']
+                ]
+        except (OSError, ValueError, TypeError, KeyError, AttributeError):
+            pass  # Missing or stale cache entry - fall back to a full parse
+        
+        rules = self.from_yaml(yaml_content)
+        self._write_cache(cache_path, rules)
+        return rules
+    
+    def _cache_path(self, yaml_content: str, cache_dir: Optional[Union[str, Path]]) -> Path:
+        """Get the cache file path for YAML content."""
+        digest = hashlib.blake2b(yaml_content.encode('utf-8'), digest_size=16).hexdigest()
+        directory = Path(os.path.expanduser(str(cache_dir or SystemConfig.RULE_CACHE_DIR)))
+        return directory / f"{digest}.json"
+    
+    def _write_cache(self, cache_path: Path, rules: List[Rule]) -> None:
+        """Write parsed rules to the cache, skipping anything JSON cannot represent."""
+        rules_data = [asdict(rule) for rule in rules]
+        try:
+            payload = json.dumps({'version': RULE_CACHE_VERSION,
+                                  'symbolica_version': _package_version(),
+                                  'rules': rules_data})
+            if json.loads(payload)['rules'] != rules_data:
+                return
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+            tmp_path.write_text(payload, encoding=SystemConfig.DEFAULT_ENCODING)
+            os.replace(tmp_path, cache_path)
+        except (OSError, TypeError, ValueError) as e:
+            logging.getLogger('symbolica.RuleLoader').debug(f"Rule cache write skipped: {e}")
+    
+    def from_dict(self, data: Dict[str, Any]) -> List[Rule]:
+        """Create rules from already-parsed YAML data with schema validation.
+        
+        Skips YAML parsing entirely; useful when rule sets are built in Python
+        or parsed in bulk (e.g. with yaml.safe_load_all).
+        """
+        return self._parse_rules_data(self.validate_schema(data))
+    
     def from_file(self, file_path: Union[str, Path]) -> List[Rule]:
         """Create rules from YAML file with schema validation."""
         try:
@@ -134,10 +233,24 @@ class RuleLoader:
             raise ValidationError("YAML content cannot be empty")
         
         try:
-            data = yaml.safe_load(yaml_content)
+            data = yaml.load(yaml_content, Loader=_YAML_LOADER)
         except yaml.YAMLError as e:
             raise ValidationError(f"Invalid YAML syntax: {e}")
         
+        return self.validate_schema(data)
+    
+    def validate_schema(self, data: Any) -> Dict[str, Any]:
+        """Validate already-parsed rule data against schema.
+        
+        Args:
+            data: Parsed YAML data (e.g. from yaml.safe_load)
+            
+        Returns:
+            Validated data
+            
+        Raises:
+            ValidationError: If schema validation fails
+        """
         if not data:
             raise ValidationError("YAML content is empty or invalid")
         
@@ -172,7 +285,10 @@ class RuleLoader:
         """Parse YAML content into rules with comprehensive validation."""
         # First validate the schema
         data = self.validate_yaml_schema(yaml_content)
-        
+        return self._parse_rules_data(data)
+    
+    def _parse_rules_data(self, data: Dict[str, Any]) -> List[Rule]:
+        """Parse schema-validated rule data into rules."""
         # Legacy validation fallback for basic structure (if strict validation disabled)
         if not self.strict_validation:
             self._legacy_validation(data)
@@ -221,8 +337,8 @@ class RuleLoader:
             id=rule_dict['id'],
             priority=rule_dict.get('priority', 100),
             condition=condition,
-            facts=facts,
-            actions=actions,
+            facts=_intern_mapping(facts),
+            actions=_intern_mapping(actions),
             triggers=rule_dict.get('triggers', []),
             tags=rule_dict.get('tags', []),
             description=rule_dict.get('description', ''),
@@ -6,7 +6,7 @@ Manages temporal operations and function registration.
 Separated from Engine to follow Single Responsibility Principle.
 """
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, ContextManager, Optional, Sequence
 from .function_registry import FunctionRegistry
 from ..._internal.storage.temporal_store import TemporalStore
 
@@ -94,6 +94,32 @@ class TemporalService:
         """
         self._store.store_datapoint(key, value, timestamp)
     
+    def store_datapoints(self, key: str, values: Sequence[float],
+                         timestamps: Optional[Sequence[float]] = None) -> None:
+        """Store a batch of time-series data points for one key.
+        
+        Args:
+            key: Metric key (e.g., 'cpu_utilization', 'error_rate')
+            values: Numeric values, oldest first
+            timestamps: Optional timestamps matching values (defaults to current time)
+            
+        Example:
+            service.store_datapoints("cpu_utilization", [82.0, 85.2, 88.9])
+        """
+        self._store.store_datapoints(key, values, timestamps)
+    
+    def frozen_time(self, now: Optional[float] = None) -> ContextManager[float]:
+        """Pin "now" for temporal functions evaluated inside the block.
+        
+        Args:
+            now: Timestamp to pin (defaults to the current time)
+            
+        Example:
+            with service.frozen_time():
+                ...  # every recent_avg()/sustained_*()/ttl_fact() sees one "now"
+        """
+        return self._store.frozen_time(now)
+    
     def set_ttl_fact(self, key: str, value: Any, ttl_seconds: int) -> None:
         """Set a fact with time-to-live (TTL).
         
@@ -6,6 +6,7 @@ Handles rule validation logic including duplicate checking and chaining validati
 Separated from Engine to follow Single Responsibility Principle.
 """
 
+import ast
 from typing import List, Set, Dict, Any
 from ..models import Rule
 from ..exceptions import ValidationError
@@ -61,6 +62,12 @@ class ValidationService:
         if not rule.condition.strip():
             raise ValidationError(f"Rule '{rule.id}' condition cannot be just whitespace")
         
+        # Syntax-only check so malformed conditions fail at load time, not on reason()
+        try:
+            ast.parse(rule.condition.strip(), mode='eval')
+        except SyntaxError as e:
+            raise ValidationError(f"Rule '{rule.id}' condition has invalid syntax: {e.msg}")
+        
         # Actions validation
         if not rule.actions or not isinstance(rule.actions, dict):
             raise ValidationError(f"Rule '{rule.id}' must have non-empty actions dictionary")
@@ -16,6 +16,7 @@ Pytest Markers:
 - extended: Extended test coverage for edge cases
 - slow: Tests that take significant time (>1s)
 - performance: Performance and benchmark tests
+- llm: Tests exercising the LLM integration
 
 Usage Examples:
     # Run all tests
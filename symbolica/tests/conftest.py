@@ -5,14 +5,20 @@ Pytest Configuration and Shared Fixtures
 Provides shared test fixtures for the simplified Symbolica engine.
 """
 
+import os
+import copy
+import hashlib
 import pytest
+import yaml
 import tempfile
 import shutil
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Callable, Dict, Any, Iterable, List
 
 from symbolica import Engine
-from symbolica.core import Rule, Facts, ExecutionResult, facts
+from symbolica.core import Rule, Facts, ExecutionResult, RuleLoader, facts
+from symbolica.core import validation
+from symbolica.core.services import loader as loader_module
 
 
 # Pytest markers configuration
@@ -24,6 +30,69 @@ def pytest_configure(config):
     config.addinivalue_line("markers", "critical: Essential tests that must pass")
     config.addinivalue_line("markers", "extended: Extended test coverage for edge cases")
     config.addinivalue_line("markers", "performance: Performance and benchmark tests")
+    config.addinivalue_line("markers", "llm: Tests exercising the LLM integration")
+
+
+def parse_rule_sets(yamls: Iterable[str]) -> List[Dict[str, Any]]:
+    """Parse several YAML rule sets in one yaml.load_all() pass.
+    
+    Uses the same libyaml-backed loader as RuleLoader; documents come back in
+    input order, ready for Engine.from_dict().
+    """
+    return list(yaml.load_all("\n---\n".join(yamls), Loader=loader_module._YAML_LOADER))
+
+
+def _loader_fingerprint() -> str:
+    """Hash the loader and validation sources that shape cached rules."""
+    sources = [Path(loader_module.__file__)]
+    sources += sorted(Path(validation.__file__).parent.glob("*.py"))
+    digest = hashlib.blake2b(digest_size=8)
+    for source in sources:
+        digest.update(source.read_bytes())
+    return digest.hexdigest()
+
+
+@pytest.fixture(scope="session")
+def rule_cache_dir(request, tmp_path_factory) -> Path:
+    """Rule cache directory shared by every pytest-xdist worker.
+    
+    Lives in pytest's cache directory so parsed rules survive across runs,
+    under a fingerprint of the loader and validation code: editing either
+    starts a fresh cache instead of serving rules that skipped the new checks.
+    Falls back to a per-run temp directory when the cache plugin is disabled.
+    """
+    cache = getattr(request.config, 'cache', None)
+    if cache is not None:
+        return cache.mkdir("symbolica_rule_cache") / _loader_fingerprint()
+    
+    base_temp = tmp_path_factory.getbasetemp()
+    if os.environ.get('PYTEST_XDIST_WORKER'):
+        # Each xdist worker gets its own basetemp under a common root
+        base_temp = base_temp.parent
+    return base_temp / "rule_cache"
+
+
+@pytest.fixture(scope="session")
+def cached_engine(rule_cache_dir) -> Callable[..., Engine]:
+    """Factory building engines from YAML through a two-level rule cache.
+    
+    Parsed rules are memoized in-process and persisted to the shared on-disk
+    JSON cache, so only the first worker of the first run to see a YAML
+    string parses it.
+    Every call returns a fresh Engine over its own copies of the rules,
+    keeping tests isolated.
+    """
+    loader = RuleLoader()
+    rules_by_yaml: Dict[str, List[Rule]] = {}
+    
+    def build(yaml_content: str, **kwargs) -> Engine:
+        rules = rules_by_yaml.get(yaml_content)
+        if rules is None:
+            rules = loader.from_yaml_cached(yaml_content, rule_cache_dir)
+            rules_by_yaml[yaml_content] = rules
+        return Engine(copy.deepcopy(rules), **kwargs)
+    
+    return build
 
 
 @pytest.fixture
@@ -318,8 +318,9 @@ class TestPerformance:
         results = []
         total_time = 0
         
+        reason = engine.reason
         for fact_set in performance_facts[:50]:  # Test first 50 for faster execution
-            result = engine.reason(fact_set)
+            result = reason(fact_set)
             results.append(result)
             total_time += result.execution_time_ms
         
@@ -16,7 +16,7 @@ class TestYamlWorkflows:
     """Test complete YAML-based workflows."""
     
     @pytest.mark.integration
-    def test_basic_yaml_workflow(self):
+    def test_basic_yaml_workflow(self, cached_engine):
         """Test basic YAML workflow from string to execution."""
         yaml_rules = """
 rules:
@@ -46,7 +46,7 @@ rules:
 """
         
         # Create engine and execute
-        engine = Engine.from_yaml(yaml_rules)
+        engine = cached_engine(yaml_rules)
         
         # Test scenario 1: Premium customer with loyalty
         facts1 = {
@@ -158,7 +158,7 @@ rules:
         assert result.verdict['product_processed'] is True
     
     @pytest.mark.integration
-    def test_structured_conditions_workflow(self):
+    def test_structured_conditions_workflow(self, cached_engine):
         """Test workflow with structured conditions (all/any/not)."""
         structured_yaml = """
 rules:
@@ -189,7 +189,7 @@ rules:
     tags: [rejection, automatic]
 """
         
-        engine = Engine.from_yaml(structured_yaml)
+        engine = cached_engine(structured_yaml)
         
         # Test case 1: Complex approval conditions met
         approval_facts = {
@@ -222,7 +222,7 @@ rules:
         assert result2.verdict['rejection_reason'] == 'automatic'
     
     @pytest.mark.integration
-    def test_priority_ordering_workflow(self):
+    def test_priority_ordering_workflow(self, cached_engine):
         """Test that rule priority ordering works correctly."""
         priority_yaml = """
 rules:
@@ -245,7 +245,7 @@ rules:
       level: premium
 """
         
-        engine = Engine.from_yaml(priority_yaml)
+        engine = cached_engine(priority_yaml)
         
         # All rules should fire, but higher priority should override
         facts = {'amount': 500}
@@ -262,7 +262,7 @@ rules:
         assert result.verdict['level'] == 'basic'  # Last one wins in our simple implementation
     
     @pytest.mark.integration
-    def test_conditional_chaining_workflow(self):
+    def test_conditional_chaining_workflow(self, cached_engine):
         """Test workflow where rules build on each other."""
         chaining_yaml = """
 rules:
@@ -291,7 +291,7 @@ rules:
     tags: [calculation]
 """
         
-        engine = Engine.from_yaml(chaining_yaml)
+        engine = cached_engine(chaining_yaml)
         
         # Test successful chaining
         facts = {
@@ -315,7 +315,7 @@ rules:
         assert result.verdict['approved'] is True
     
     @pytest.mark.integration
-    def test_error_handling_in_workflow(self):
+    def test_error_handling_in_workflow(self, cached_engine):
         """Test error handling during YAML workflow execution."""
         # Test with invalid YAML structure
         invalid_yaml = """
@@ -338,7 +338,7 @@ rules:
       result: calculated
 """
         
-        engine = Engine.from_yaml(problematic_yaml)
+        engine = cached_engine(problematic_yaml)
         
         # Should handle division by zero gracefully
         facts = {'amount': 1000, 'zero_value': 0}
@@ -349,7 +349,34 @@ rules:
         assert result.verdict == {}
     
     @pytest.mark.integration
-    def test_mixed_condition_formats_workflow(self):
+    def test_cached_engines_share_no_rule_state(self, cached_engine):
+        """Test that engines from the cached_engine fixture share no Rule objects or containers."""
+        repeated_yaml = """
+rules:
+  - id: shared_rule
+    if: "amount > 1000"
+    then:
+      hit: true
+      limits: [1, 2]
+    tags: [repeat]
+"""
+        first = cached_engine(repeated_yaml)
+        second = cached_engine(repeated_yaml)
+        
+        first_rule, second_rule = first.rules[0], second.rules[0]
+        assert first_rule == second_rule
+        assert first_rule is not second_rule
+        assert first_rule.actions is not second_rule.actions
+        assert first_rule.actions['limits'] is not second_rule.actions['limits']
+        assert first_rule.tags is not second_rule.tags
+        
+        first_rule.actions['hit'] = False
+        first_rule.actions['limits'].append(3)
+        assert second.reason({'amount': 1500}).verdict == {'hit': True, 'limits': [1, 2]}
+        assert cached_engine(repeated_yaml).rules[0].actions == {'hit': True, 'limits': [1, 2]}
+    
+    @pytest.mark.integration
+    def test_mixed_condition_formats_workflow(self, cached_engine):
         """Test workflow with mixed condition formats."""
         mixed_yaml = """
 rules:
@@ -378,7 +405,7 @@ rules:
     tags: [alternative]
 """
         
-        engine = Engine.from_yaml(mixed_yaml)
+        engine = cached_engine(mixed_yaml)
         
         # Test facts that should trigger all rules
         facts = {
@@ -402,7 +429,7 @@ rules:
         assert result.verdict['alternative_format'] is True
     
     @pytest.mark.integration
-    def test_performance_workflow(self):
+    def test_performance_workflow(self, cached_engine):
         """Test performance characteristics of YAML workflows."""
         # Generate larger rule set for performance testing
         rules = ["rules:"]
@@ -418,7 +445,7 @@ rules:
 """)
         
         large_yaml = '\n'.join(rules)
-        engine = Engine.from_yaml(large_yaml)
+        engine = cached_engine(large_yaml)
         
         # Test execution performance
         facts = {'test_value': 50, 'active': True}
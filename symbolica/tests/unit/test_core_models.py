@@ -5,6 +5,8 @@ Unit Tests for Simplified Core Models
 Tests for Rule, Facts, ExecutionContext, ExecutionResult in the simplified architecture.
 """
 
+import sys
+
 import pytest
 from typing import Dict, Any
 
@@ -98,6 +100,25 @@ class TestRule:
         
         with pytest.raises(AttributeError):
             rule.priority = 200
+    
+    @pytest.mark.unit
+    @pytest.mark.skipif(sys.version_info < (3, 10), reason="slotted dataclasses require Python 3.10+")
+    def test_models_are_slotted(self):
+        """Test that hot-path models carry no per-instance __dict__."""
+        rule = Rule(id="test", priority=100, condition="amount > 1000", actions={'tier': 'premium'})
+        result = ExecutionResult(verdict={}, fired_rules=[], execution_time_ms=0.0, reasoning="")
+        
+        assert not hasattr(rule, '__dict__')
+        assert not hasattr(facts(amount=1), '__dict__')
+        assert not hasattr(result, '__dict__')
+    
+    @pytest.mark.unit
+    def test_rule_id_is_interned(self):
+        """Test that rule IDs are interned for fast hashing and comparison."""
+        rule_id = "".join(["interned", "_rule"])  # Built at runtime, not a literal
+        rule = Rule(id=rule_id, priority=100, condition="amount > 1000", actions={'tier': 'premium'})
+        
+        assert rule.id is sys.intern("interned_rule")
 
 
 class TestFacts:
@@ -5,6 +5,9 @@ Unit Tests for Core Engine Functionality
 Tests for basic Engine operations, creation, reasoning, analysis, tracing, and explanations.
 """
 
+import gc
+import weakref
+
 import pytest
 from symbolica import Engine, facts
 from symbolica.core.models import Rule
@@ -126,6 +129,54 @@ class TestBasicEngine:
         assert "basic_rule" in result.fired_rules
         assert result.execution_time_ms > 0
 
+    @pytest.mark.unit
+    def test_reason_cached(self):
+        """Test that repeated fact sets reuse results until the rules change."""
+        engine = Engine([Rule(id="basic_rule", priority=1, condition="value > 10",
+                              actions={"result": "high"})])
+        
+        first = engine.reason_cached(facts(value=20))
+        assert engine.reason_cached({"value": 20}) is first
+        assert first.verdict == {"result": "high"}
+        
+        engine.update_rule("basic_rule", Rule(id="basic_rule", priority=1, condition="value > 10",
+                                              actions={"result": "very_high"}))
+        assert engine.reason_cached(facts(value=20)).verdict == {"result": "very_high"}
+        
+        # Unhashable fact values bypass the cache
+        listed = engine.reason_cached(facts(value=20, tags=["a"]))
+        assert listed.verdict == {"result": "very_high"}
+        assert engine.reason_cached(facts(value=20, tags=["a"])) is not listed
+
+    @pytest.mark.unit
+    def test_reason_cached_distinguishes_equal_values_of_other_types(self):
+        """Test that 1, True and 1.0 facts get separate cache entries."""
+        engine = Engine([
+            Rule(id=f"is_{kind}", priority=1, condition=f"kind_of(x) == '{kind}'",
+                 actions={"kind": kind})
+            for kind in ("int", "bool", "float")
+        ])
+        engine.register_function("kind_of", lambda value: type(value).__name__)
+        
+        results = [engine.reason_cached({"x": value}) for value in (1, True, 1.0)]
+        assert [r.verdict for r in results] == [{"kind": "int"}, {"kind": "bool"}, {"kind": "float"}]
+        assert engine.reason_cached({"x": True}) is results[1]
+    
+    @pytest.mark.unit
+    def test_reason_cached_keeps_no_reference_cycle(self):
+        """Test that an engine with cached results is freed without the cycle collector."""
+        engine = Engine([Rule(id="basic_rule", priority=1, condition="value > 10",
+                              actions={"result": "high"})])
+        engine.reason_cached({"value": 20})
+        engine_ref = weakref.ref(engine)
+        
+        gc.disable()
+        try:
+            del engine
+            assert engine_ref() is None
+        finally:
+            gc.enable()
+
 
 class TestTracing:
     """Enhanced tracing functionality tests."""
@@ -6,7 +6,9 @@ Tests for file loading, directory operations, error handling, and performance.
 """
 
 import pytest
+import sys
 import tempfile
+import yaml
 from pathlib import Path
 from unittest.mock import patch
 from symbolica import Engine, facts
@@ -93,6 +95,55 @@ rules:
         
         with pytest.raises(ValidationError):
             Engine.from_file(corrupted_file)
+    
+    @pytest.mark.unit
+    def test_from_yaml_cached_round_trip(self, temp_directory):
+        """Test that cached engines load from the JSON cache and behave identically."""
+        yaml_content = """
+rules:
+  - id: cached_rule
+    priority: 50
+    if: "amount > 1000"
+    then:
+      tier: premium
+      limits: [1, 2, 3]
+    tags: [cache]
+"""
+        cache_dir = temp_directory / "cache"
+        first = Engine.from_yaml_cached(yaml_content, cache_dir=cache_dir)
+        assert len(list(cache_dir.glob("*.json"))) == 1
+        
+        with patch('symbolica.core.services.loader.yaml.load') as yaml_load:
+            second = Engine.from_yaml_cached(yaml_content, cache_dir=cache_dir)
+            yaml_load.assert_not_called()
+        
+        assert second.rules == first.rules
+        assert second.rules[0].actions['tier'] is sys.intern('premium')
+        assert second.reason(facts(amount=1500)).verdict == {'tier': 'premium', 'limits': [1, 2, 3]}
+    
+    @pytest.mark.unit
+    def test_from_yaml_cached_reparses_after_upgrade(self, temp_directory):
+        """Test that cache entries written by another symbolica version are not served."""
+        yaml_content = """
+rules:
+  - id: versioned_rule
+    if: "amount > 1000"
+    then:
+      tier: premium
+"""
+        cache_dir = temp_directory / "cache"
+        with patch('symbolica.__version__', '0.0.1'):
+            Engine.from_yaml_cached(yaml_content, cache_dir=cache_dir)
+        
+        with patch('symbolica.core.services.loader.yaml.load', wraps=yaml.load) as yaml_load:
+            engine = Engine.from_yaml_cached(yaml_content, cache_dir=cache_dir)
+            yaml_load.assert_called_once()
+        assert engine.reason(facts(amount=1500)).verdict == {'tier': 'premium'}
+        
+        # The re-parse replaced the stale entry
+        with patch('symbolica.core.services.loader.yaml.load') as yaml_load:
+            Engine.from_yaml_cached(yaml_content, cache_dir=cache_dir)
+            yaml_load.assert_not_called()
 
 
 class TestErrorHandling:
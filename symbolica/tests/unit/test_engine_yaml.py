@@ -6,8 +6,9 @@ Tests for YAML parsing, validation, and structured condition handling.
 """
 
 import pytest
+from unittest.mock import patch
 from symbolica import Engine
-from symbolica.core import ValidationError
+from symbolica.core import Rule, ValidationError
 
 
 class TestYamlParsing:
@@ -156,6 +157,68 @@ data: more_data
         with pytest.raises(ValidationError, match="YAML must contain 'rules' key"):
             Engine.from_yaml(no_rules_yaml)
     
+    @pytest.mark.unit
+    def test_from_dict_applies_schema_validation(self):
+        """Test that pre-parsed rule data goes through the same schema validation."""
+        with pytest.raises(ValidationError, match="Missing required top-level keys"):
+            Engine.from_dict({'other_key': 'some_value'})
+        
+        engine = Engine.from_dict({'rules': [
+            {'id': 'dict_rule', 'if': 'amount > 1000', 'then': {'tier': 'premium'}}
+        ]})
+        assert engine.rules[0].id == 'dict_rule'
+    
+    @pytest.mark.unit
+    def test_repeated_yaml_reuses_parsed_rules(self):
+        """Test that repeating the last YAML skips parsing but returns a fresh engine."""
+        repeated_yaml = """
+rules:
+  - id: repeated_rule
+    if: "amount > 1000"
+    then:
+      tier: premium
+"""
+        first = Engine.from_yaml(repeated_yaml)
+        
+        with patch('symbolica.core.engine.RuleLoader.validate_yaml_schema') as validate:
+            second = Engine.from_yaml(repeated_yaml)
+        
+        validate.assert_not_called()
+        assert second is not first
+        assert second.rules == first.rules
+        
+        second.add_rule(Rule(id='extra_rule', priority=0, condition='amount > 0',
+                             actions={'seen': True}))
+        assert first.rule_count == 1
+        assert Engine.from_yaml(repeated_yaml).rule_count == 1
+    
+    @pytest.mark.unit
+    def test_repeated_yaml_shares_no_rule_state(self):
+        """Test that engines built from equal YAML share no Rule objects or containers."""
+        repeated_yaml = """
+rules:
+  - id: shared_rule
+    if: "amount > 1000"
+    then:
+      hit: true
+      limits: [1, 2]
+    tags: [repeat]
+"""
+        first = Engine.from_yaml(repeated_yaml)
+        second = Engine.from_yaml(repeated_yaml)
+        
+        first_rule, second_rule = first.rules[0], second.rules[0]
+        assert first_rule == second_rule
+        assert first_rule is not second_rule
+        assert first_rule.actions is not second_rule.actions
+        assert first_rule.actions['limits'] is not second_rule.actions['limits']
+        assert first_rule.tags is not second_rule.tags
+        
+        first_rule.actions['hit'] = False
+        first_rule.actions['limits'].append(3)
+        assert second.reason({'amount': 1500}).verdict == {'hit': True, 'limits': [1, 2]}
+        assert Engine.from_yaml(repeated_yaml).rules[0].actions == {'hit': True, 'limits': [1, 2]}
+    
     @pytest.mark.unit
     def test_empty_rules(self):
         """Test error when rules list is empty."""
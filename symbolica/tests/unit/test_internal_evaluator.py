@@ -5,11 +5,14 @@ Unit Tests for Simplified AST Evaluator
 Tests for the simplified AST-based expression evaluator.
 """
 
+import ast
 import pytest
 from typing import Dict, Any
 
 from symbolica.core import ExecutionContext, facts, EvaluationError
 from symbolica._internal.evaluation.evaluator import ASTEvaluator
+from symbolica._internal.evaluation.core_evaluator import CoreEvaluator
+from symbolica._internal.evaluation.condition_compiler import compile_condition, run_condition
 
 
 class TestASTEvaluator:
@@ -331,6 +334,60 @@ class TestEvaluatorFactory:
         assert callable(evaluator.extract_fields)
 
 
+class TestConditionCompiler:
+    """Test the compiled fast path for simple conditions."""
+    
+    @pytest.fixture
+    def context(self, sample_facts):
+        """Create execution context."""
+        return ExecutionContext(
+            original_facts=facts(**sample_facts),
+            enriched_facts={},
+            fired_rules=[]
+        )
+    
+    @pytest.mark.unit
+    @pytest.mark.parametrize("expression", [
+        "amount > 1000",
+        "amount > 1000 and status == 'active'",
+        "status == 'inactive' or risk_score < 50",
+        "not (amount < 100 or country not in ['US', 'CA'])",
+        "(amount - 500) / 2 >= account_balance % 7 * -1",
+        "last_login == null and account_verified == true",
+        "missing_field == None",
+    ])
+    def test_compiled_matches_ast_walk(self, context, expression):
+        """Test that compiled programs agree with the AST walker, including field values."""
+        program = compile_condition(expression)
+        assert program is not None
+        
+        walker = CoreEvaluator()
+        expected = walker._eval_node(ast.parse(expression, mode='eval').body, context)
+        
+        assert run_condition(program, context) == expected
+    
+    @pytest.mark.unit
+    @pytest.mark.parametrize("expression", [
+        "len(tags) > 1",
+        "tags[0] == 'vip'",
+        "1 < amount < 2000",
+        "amount ** 2 > 10",
+        "'a' if amount else 'b'",
+    ])
+    def test_unsupported_expressions_fall_back(self, expression):
+        """Test that expressions outside the compiled subset are left to the AST walker."""
+        assert compile_condition(expression) is None
+    
+    @pytest.mark.unit
+    def test_compiled_errors(self, context):
+        """Test that compiled programs raise evaluation errors like the AST walker."""
+        with pytest.raises(EvaluationError, match="Division by zero"):
+            run_condition(compile_condition("amount / 0 > 1"), context)
+        
+        with pytest.raises(EvaluationError, match="Type error in comparison"):
+            run_condition(compile_condition("last_login > 5"), context)
+
+
 class TestExpressionTestCases:
     """Test expression evaluation using parametrized test cases from conftest."""
     
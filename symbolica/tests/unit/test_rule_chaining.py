@@ -1,18 +1,19 @@
 """
 Unit tests for rule chaining and DAG strategy functionality.
+
+Rule sets are declared once at module level and parsed in a single
+parse_rule_sets() pass at import time; tests build engines from the
+pre-parsed documents via Engine.from_dict().
 """
 
 import pytest
 from symbolica import Engine, facts
 from symbolica.core.exceptions import ValidationError
+from symbolica.tests.conftest import parse_rule_sets
 
 
-class TestBasicRuleChaining:
-    """Test basic rule chaining functionality."""
-    
-    def test_simple_chaining(self):
-        """Test basic two-rule chaining."""
-        yaml_rules = """
+RULE_SETS = {
+    'simple_chaining': """
 rules:
   - id: first_rule
     condition: "score > 70"
@@ -23,22 +24,8 @@ rules:
     condition: "passed == true"
     actions:
       bonus: 100
-"""
-        
-        engine = Engine.from_yaml(yaml_rules)
-        result = engine.reason(facts(score=80))
-        
-        # Both rules should fire
-        assert result.verdict == {"passed": True, "bonus": 100}
-        assert "first_rule" in result.fired_rules
-        assert "second_rule" in result.fired_rules
-        
-        # Check execution order
-        assert result.fired_rules.index("first_rule") < result.fired_rules.index("second_rule")
-    
-    def test_chaining_with_explicit_triggers(self):
-        """Test chaining with explicit trigger declarations."""
-        yaml_rules = """
+""",
+    'chaining_with_explicit_triggers': """
 rules:
   - id: trigger_rule
     condition: "value > 50"
@@ -50,20 +37,8 @@ rules:
     condition: "triggered == true"
     actions:
       result: "success"
-"""
-        
-        engine = Engine.from_yaml(yaml_rules)
-        result = engine.reason(facts(value=60))
-        
-        assert result.verdict == {"triggered": True, "result": "success"}
-        assert result.fired_rules == ["trigger_rule", "dependent_rule"]
-        
-        # Check reasoning includes trigger information
-        assert "triggered by trigger_rule" in result.reasoning
-    
-    def test_multiple_dependency_chaining(self):
-        """Test chaining with multiple dependencies."""
-        yaml_rules = """
+""",
+    'multiple_dependency_chaining': """
 rules:
   - id: check_score
     condition: "score > 70"
@@ -80,23 +55,8 @@ rules:
     actions:
       approved: true
       level: "senior"
-"""
-        
-        engine = Engine.from_yaml(yaml_rules)
-        result = engine.reason(facts(score=85, years=3))
-        
-        assert result.verdict == {
-            "score_ok": True, 
-            "exp_ok": True, 
-            "approved": True, 
-            "level": "senior"
-        }
-        assert len(result.fired_rules) == 3
-        assert "final_decision" in result.fired_rules
-    
-    def test_no_chaining_when_condition_fails(self):
-        """Test that chaining doesn't occur when initial condition fails."""
-        yaml_rules = """
+""",
+    'no_chaining_when_condition_fails': """
 rules:
   - id: first_rule
     condition: "score > 90"  # High threshold
@@ -107,22 +67,8 @@ rules:
     condition: "passed == true"
     actions:
       bonus: 100
-"""
-        
-        engine = Engine.from_yaml(yaml_rules)
-        result = engine.reason(facts(score=80))  # Doesn't meet threshold
-        
-        # No rules should fire
-        assert result.verdict == {}
-        assert result.fired_rules == []
-
-
-class TestComplexChaining:
-    """Test complex chaining scenarios."""
-    
-    def test_multi_level_chaining(self):
-        """Test chaining across multiple levels."""
-        yaml_rules = """
+""",
+    'multi_level_chaining': """
 rules:
   - id: level1
     condition: "input > 0"
@@ -139,22 +85,8 @@ rules:
     actions:
       level3_done: true
       final_result: "completed"
-"""
-        
-        engine = Engine.from_yaml(yaml_rules)
-        result = engine.reason(facts(input=5))
-        
-        assert result.verdict == {
-            "level1_done": True,
-            "level2_done": True, 
-            "level3_done": True,
-            "final_result": "completed"
-        }
-        assert result.fired_rules == ["level1", "level2", "level3"]
-    
-    def test_conditional_chaining_paths(self):
-        """Test different chaining paths based on conditions."""
-        yaml_rules = """
+""",
+    'conditional_chaining_paths': """
 rules:
   - id: initial_check
     condition: "score >= 0"
@@ -178,28 +110,8 @@ rules:
     actions:
       path: "low"
       bonus: 100
-"""
-        
-        engine = Engine.from_yaml(yaml_rules)
-        
-        # Test high score path
-        result_high = engine.reason(facts(score=90))
-        assert result_high.verdict["path"] == "high"
-        assert result_high.verdict["bonus"] == 1000
-        
-        # Test medium score path
-        result_medium = engine.reason(facts(score=70))
-        assert result_medium.verdict["path"] == "medium"
-        assert result_medium.verdict["bonus"] == 500
-        
-        # Test low score path
-        result_low = engine.reason(facts(score=50))
-        assert result_low.verdict["path"] == "low"
-        assert result_low.verdict["bonus"] == 100
-    
-    def test_chaining_with_multiple_fact_types(self):
-        """Test chaining with different data types."""
-        yaml_rules = """
+""",
+    'chaining_with_multiple_fact_types': """
 rules:
   - id: string_processor
     condition: "name != None"
@@ -218,22 +130,8 @@ rules:
     actions:
       combined: true
       message: "Welcome adult"
-"""
-        
-        engine = Engine.from_yaml(yaml_rules)
-        result = engine.reason(facts(name="John", age=25))
-        
-        assert result.verdict["combined"] is True
-        assert result.verdict["message"] == "Welcome adult"
-        assert len(result.fired_rules) == 3
-
-
-class TestDAGStrategy:
-    """Test DAG strategy for dependency ordering."""
-    
-    def test_dag_execution_order(self):
-        """Test that DAG strategy orders rules by dependencies."""
-        yaml_rules = """
+""",
+    'dag_execution_order': """
 rules:
   - id: depends_on_others
     condition: "fact1 == true and fact2 == true"
@@ -249,21 +147,8 @@ rules:
     condition: "input2 > 0"
     actions:
       fact2: true
-"""
-        
-        engine = Engine.from_yaml(yaml_rules)
-        
-        # Get execution order from DAG
-        execution_order = engine._dag_strategy.get_execution_order(engine._rules)
-        rule_names = [rule.id for rule in execution_order]
-        
-        # Producers should come before consumers
-        assert rule_names.index("produces_fact1") < rule_names.index("depends_on_others")
-        assert rule_names.index("produces_fact2") < rule_names.index("depends_on_others")
-    
-    def test_dag_with_priorities(self):
-        """Test DAG respects priorities within dependency levels."""
-        yaml_rules = """
+""",
+    'dag_with_priorities': """
 rules:
   - id: high_priority_consumer
     priority: 100
@@ -282,27 +167,8 @@ rules:
     condition: "input > 0"
     actions:
       base_fact: true
-"""
-        
-        engine = Engine.from_yaml(yaml_rules)
-        execution_order = engine._dag_strategy.get_execution_order(engine._rules)
-        rule_names = [rule.id for rule in execution_order]
-        
-        # Producer must come first
-        assert rule_names[0] == "producer"
-        
-        # Among consumers, higher priority should come first
-        high_idx = rule_names.index("high_priority_consumer")
-        low_idx = rule_names.index("low_priority_consumer")
-        assert high_idx < low_idx
-
-
-class TestIterativeExecution:
-    """Test iterative rule execution engine."""
-    
-    def test_iteration_convergence(self):
-        """Test that iteration stops when no new rules can fire."""
-        yaml_rules = """
+""",
+    'iteration_convergence': """
 rules:
   - id: rule1
     condition: "start == true"
@@ -318,9 +184,182 @@ rules:
     condition: "step2 == true"
     actions:
       final: true
-"""
+""",
+    'self_referential_condition': """
+rules:
+  - id: self_ref_rule
+    condition: "counter < 5"
+    actions:
+      counter: 3  # Sets to fixed value, not incrementing
+""",
+    'boolean_literal_handling': """
+rules:
+  - id: test_true
+    condition: "flag == true"
+    actions:
+      result1: "matched_true"
+      
+  - id: test_True
+    condition: "flag == True"  
+    actions:
+      result2: "matched_True"
+      
+  - id: test_false
+    condition: "flag == false"
+    actions:
+      result3: "matched_false"
+""",
+    'missing_field_handling': """
+rules:
+  - id: missing_field_rule
+    condition: "nonexistent_field == true"
+    actions:
+      should_not_fire: true
+      
+  - id: existing_field_rule
+    condition: "existing_field > 0"
+    actions:
+      should_fire: true
+""",
+}
+
+# Parse every rule set in one pass
+PARSED_RULE_SETS = dict(zip(RULE_SETS, parse_rule_sets(RULE_SETS.values())))
+
+
+class TestBasicRuleChaining:
+    """Test basic rule chaining functionality."""
+    
+    def test_simple_chaining(self):
+        """Test basic two-rule chaining."""
+        engine = Engine.from_dict(PARSED_RULE_SETS['simple_chaining'])
+        result = engine.reason(facts(score=80))
+        
+        # Both rules should fire
+        assert result.verdict == {"passed": True, "bonus": 100}
+        assert "first_rule" in result.fired_rules
+        assert "second_rule" in result.fired_rules
+        
+        # Check execution order
+        rank = {rule_id: i for i, rule_id in enumerate(result.fired_rules)}
+        assert rank["first_rule"] < rank["second_rule"]
+    
+    def test_chaining_with_explicit_triggers(self):
+        """Test chaining with explicit trigger declarations."""
+        engine = Engine.from_dict(PARSED_RULE_SETS['chaining_with_explicit_triggers'])
+        result = engine.reason(facts(value=60))
+        
+        assert result.verdict == {"triggered": True, "result": "success"}
+        assert result.fired_rules == ["trigger_rule", "dependent_rule"]
+        
+        # Check reasoning includes trigger information
+        assert "triggered by trigger_rule" in result.reasoning
+    
+    def test_multiple_dependency_chaining(self):
+        """Test chaining with multiple dependencies."""
+        engine = Engine.from_dict(PARSED_RULE_SETS['multiple_dependency_chaining'])
+        result = engine.reason(facts(score=85, years=3))
+        
+        assert result.verdict == {
+            "score_ok": True, 
+            "exp_ok": True, 
+            "approved": True, 
+            "level": "senior"
+        }
+        assert len(result.fired_rules) == 3
+        assert "final_decision" in result.fired_rules
+    
+    def test_no_chaining_when_condition_fails(self):
+        """Test that chaining doesn't occur when initial condition fails."""
+        engine = Engine.from_dict(PARSED_RULE_SETS['no_chaining_when_condition_fails'])
+        result = engine.reason(facts(score=80))  # Doesn't meet threshold
+        
+        # No rules should fire
+        assert result.verdict == {}
+        assert result.fired_rules == []
+
+
+class TestComplexChaining:
+    """Test complex chaining scenarios."""
+    
+    def test_multi_level_chaining(self):
+        """Test chaining across multiple levels."""
+        engine = Engine.from_dict(PARSED_RULE_SETS['multi_level_chaining'])
+        result = engine.reason(facts(input=5))
+        
+        assert result.verdict == {
+            "level1_done": True,
+            "level2_done": True, 
+            "level3_done": True,
+            "final_result": "completed"
+        }
+        assert result.fired_rules == ["level1", "level2", "level3"]
+    
+    def test_conditional_chaining_paths(self):
+        """Test different chaining paths based on conditions."""
+        engine = Engine.from_dict(PARSED_RULE_SETS['conditional_chaining_paths'])
+        
+        # Test high score path
+        result_high = engine.reason(facts(score=90))
+        assert result_high.verdict["path"] == "high"
+        assert result_high.verdict["bonus"] == 1000
+        
+        # Test medium score path
+        result_medium = engine.reason(facts(score=70))
+        assert result_medium.verdict["path"] == "medium"
+        assert result_medium.verdict["bonus"] == 500
+        
+        # Test low score path
+        result_low = engine.reason(facts(score=50))
+        assert result_low.verdict["path"] == "low"
+        assert result_low.verdict["bonus"] == 100
+    
+    def test_chaining_with_multiple_fact_types(self):
+        """Test chaining with different data types."""
+        engine = Engine.from_dict(PARSED_RULE_SETS['chaining_with_multiple_fact_types'])
+        result = engine.reason(facts(name="John", age=25))
+        
+        assert result.verdict["combined"] is True
+        assert result.verdict["message"] == "Welcome adult"
+        assert len(result.fired_rules) == 3
+
+
+class TestDAGStrategy:
+    """Test DAG strategy for dependency ordering."""
+    
+    def test_dag_execution_order(self):
+        """Test that DAG strategy orders rules by dependencies."""
+        engine = Engine.from_dict(PARSED_RULE_SETS['dag_execution_order'])
+        
+        # Get execution order from DAG
+        execution_order = engine._dag_strategy.get_execution_order(engine._rules)
+        rule_names = [rule.id for rule in execution_order]
+        
+        # Producers should come before consumers
+        rank = {rule_id: i for i, rule_id in enumerate(rule_names)}
+        assert rank["produces_fact1"] < rank["depends_on_others"]
+        assert rank["produces_fact2"] < rank["depends_on_others"]
+    
+    def test_dag_with_priorities(self):
+        """Test DAG respects priorities within dependency levels."""
+        engine = Engine.from_dict(PARSED_RULE_SETS['dag_with_priorities'])
+        execution_order = engine._dag_strategy.get_execution_order(engine._rules)
+        rule_names = [rule.id for rule in execution_order]
+        
+        # Producer must come first
+        assert rule_names[0] == "producer"
         
-        engine = Engine.from_yaml(yaml_rules)
+        # Among consumers, higher priority should come first
+        rank = {rule_id: i for i, rule_id in enumerate(rule_names)}
+        assert rank["high_priority_consumer"] < rank["low_priority_consumer"]
+
+
+class TestIterativeExecution:
+    """Test iterative rule execution engine."""
+    
+    def test_iteration_convergence(self):
+        """Test that iteration stops when no new rules can fire."""
+        engine = Engine.from_dict(PARSED_RULE_SETS['iteration_convergence'])
         result = engine.reason(facts(start=True))
         
         # All rules should fire in sequence
@@ -340,15 +379,7 @@ class TestRuleChainingEdgeCases:
     
     def test_self_referential_condition(self):
         """Test rule that references its own output."""
-        yaml_rules = """
-rules:
-  - id: self_ref_rule
-    condition: "counter < 5"
-    actions:
-      counter: 3  # Sets to fixed value, not incrementing
-"""
-        
-        engine = Engine.from_yaml(yaml_rules)
+        engine = Engine.from_dict(PARSED_RULE_SETS['self_referential_condition'])
         result = engine.reason(facts(counter=2))
         
         # Rule should fire once and set counter to 3
@@ -357,25 +388,7 @@ rules:
     
     def test_boolean_literal_handling(self):
         """Test proper handling of boolean literals in conditions."""
-        yaml_rules = """
-rules:
-  - id: test_true
-    condition: "flag == true"
-    actions:
-      result1: "matched_true"
-      
-  - id: test_True
-    condition: "flag == True"  
-    actions:
-      result2: "matched_True"
-      
-  - id: test_false
-    condition: "flag == false"
-    actions:
-      result3: "matched_false"
-"""
-        
-        engine = Engine.from_yaml(yaml_rules)
+        engine = Engine.from_dict(PARSED_RULE_SETS['boolean_literal_handling'])
         
         # Test with True flag
         result_true = engine.reason(facts(flag=True))
@@ -388,20 +401,7 @@ rules:
     
     def test_missing_field_handling(self):
         """Test that missing fields are handled gracefully."""
-        yaml_rules = """
-rules:
-  - id: missing_field_rule
-    condition: "nonexistent_field == true"
-    actions:
-      should_not_fire: true
-      
-  - id: existing_field_rule
-    condition: "existing_field > 0"
-    actions:
-      should_fire: true
-"""
-        
-        engine = Engine.from_yaml(yaml_rules)
+        engine = Engine.from_dict(PARSED_RULE_SETS['missing_field_handling'])
         result = engine.reason(facts(existing_field=5))
         
         # Only rule with existing field should fire
@@ -0,0 +1,136 @@
+"""
+Unit Tests for Rule Visualization
+=================================
+
+Tests for the cached analyses of the visualization package.
+"""
+
+import logging
+
+import pytest
+from symbolica import Engine
+from symbolica.core import Rule
+
+visualization = pytest.importorskip("visualization")
+RuleVisualizer = visualization.RuleVisualizer
+ASTVisualizer = visualization.ASTVisualizer
+
+
+RULES_YAML = """
+rules:
+  - id: a
+    priority: 100
+    condition: "amount > 1000"
+    actions:
+      tier: premium
+  - id: b
+    priority: 50
+    condition: "tier == 'premium'"
+    actions:
+      discount: 0.1
+"""
+
+
+class TestRuleVisualizerCache:
+    """Test invalidation of the RuleVisualizer caches."""
+
+    @pytest.mark.unit
+    def test_invalidate_cache_rereads_engine_rules(self):
+        """Test that rules added to the engine show up after invalidate_cache()."""
+        engine = Engine.from_yaml(RULES_YAML)
+        visualizer = RuleVisualizer(engine)
+
+        assert visualizer.get_execution_summary()['statistics']['total_rules'] == 2
+        assert visualizer.analyze_rule('c') == {'error': 'Rule c not found'}
+
+        engine.add_rule(Rule(id='c', priority=10, condition="discount > 0",
+                             actions={'notified': True}))
+        visualizer.invalidate_cache()
+
+        summary = visualizer.get_execution_summary()
+        assert summary['statistics']['total_rules'] == 3
+        assert 'c' in [rule_id for level in summary['execution_levels'] for rule_id in level]
+        analysis = visualizer.analyze_rule('c')
+        assert analysis['rule']['condition'] == "discount > 0"
+        assert analysis['ast'] is not None
+        assert analysis['condition_fields'] == ['discount']
+
+    @pytest.mark.unit
+    def test_results_cached_until_invalidated(self):
+        """Test that analyses are reused until invalidate_cache() is called."""
+        visualizer = RuleVisualizer(Engine.from_yaml(RULES_YAML))
+
+        summary = visualizer.get_execution_summary()
+        analysis = visualizer.analyze_rule('b')
+        assert visualizer.get_execution_summary() is summary
+        assert visualizer.analyze_rule('b') is analysis
+
+        visualizer.invalidate_cache()
+        assert visualizer.get_execution_summary() is not summary
+        assert visualizer.analyze_rule('b') is not analysis
+        assert visualizer.analyze_rule('b') == analysis
+
+
+class TestASTVisualizerRules:
+    """Test that ASTVisualizer lookups follow reassigned rule lists."""
+
+    @pytest.mark.unit
+    def test_reassigned_rules_replace_lookups(self):
+        """Test that get_ast_tree() and get_all_asts() see a new rule list."""
+        rule_a = Rule(id='a', priority=1, condition="x > 1", actions={'r': 1})
+        rule_b = Rule(id='b', priority=1, condition="y < 2", actions={'r': 2})
+        visualizer = ASTVisualizer([rule_a])
+        assert list(visualizer.get_all_asts()) == ['a']
+
+        visualizer.rules = [rule_b]
+        assert list(visualizer.get_all_asts()) == ['b']
+        assert visualizer.get_ast_tree('b') is not None
+        assert visualizer.get_ast_tree('a') is None
+
+    @pytest.mark.unit
+    def test_all_asts_reused_for_same_rule_list(self):
+        """Test that the AST mapping is built once per rule list."""
+        visualizer = ASTVisualizer([Rule(id='a', priority=1, condition="x > 1", actions={'r': 1})])
+        assert visualizer.get_all_asts() is visualizer.get_all_asts()
+
+
+class TestASTTextTree:
+    """Test text rendering of parsed conditions."""
+
+    @pytest.mark.unit
+    def test_calls_and_arithmetic_rendered(self, caplog):
+        """Test that function calls and arithmetic render without raw dumps or warnings."""
+        visualizer = ASTVisualizer([])
+        with caplog.at_level(logging.WARNING, logger="visualization.ast_visualizer"):
+            text = visualizer.to_text_tree(visualizer.parse_condition("len(items) + 2 * x > 10"))
+        assert text == "\n".join([
+            "Compare:",
+            "  Add:",
+            "    Call: len",
+            "      Field: items",
+            "    Mult:",
+            "      Value: 2",
+            "      Field: x",
+            "  Ops: Gt",
+            "  Values: Value: 10",
+        ])
+        assert caplog.records == []
+
+    @pytest.mark.unit
+    def test_subscript_index_rendered(self):
+        """Test that subscripts render their index value directly."""
+        visualizer = ASTVisualizer([])
+        text = visualizer.to_text_tree(visualizer.parse_condition("data[0] > 1"))
+        assert "    Index: Value: 0" in text.splitlines()
+
+    @pytest.mark.unit
+    def test_fallback_parser_reads_leading_zero_integers(self):
+        """Test that non-Python conditions keep leading-zero integers numeric."""
+        visualizer = ASTVisualizer([])
+        node = visualizer.parse_condition("zip_prefix == 07")
+        assert node.as_dict() == {
+            'type': 'Compare',
+            'left': {'type': 'Name', 'id': 'zip_prefix'},
+            'ops': ['Eq'],
+            'comparators': [{'type': 'Constant', 'value': 7}],
+        }
@@ -7,7 +7,205 @@ Visualizes how rule conditions are parsed into abstract syntax trees.
 
 import ast
 import json
-from typing import Dict, List, Any, Optional
+import keyword
+import logging
+import re
+import sys
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, List, Any, Mapping, Optional
+
+
+logger = logging.getLogger(__name__)
+
+# Node types already reported as lacking a text renderer (logged once each)
+_UNRENDERED_NODE_TYPES = set()
+
+# "<field> <op> <value>" for conditions that are not valid Python; the
+# surrounding whitespace is consumed so the groups come back stripped
+_SIMPLE_CONDITION_RE = re.compile(r'(.*?)\s*(>=|<=|==|!=|>|<| in )\s*(.*)', re.DOTALL)
+
+# "<name> <op> <literal>" that ast.parse would turn into a single Compare
+# of a Name against a Constant. Literals are limited to forms whose value
+# is unambiguous without the tokenizer: short unsigned decimals, quoted
+# strings without escapes, and True/False/None.
+_TRIVIAL_COMPARE_RE = re.compile(
+    r"([A-Za-z_]\w*)[ \t]*(>=|<=|==|!=|>|<)[ \t]*"
+    r"(?:(?P<num>(?:0|[1-9]\d{0,17})(?:\.\d{1,17})?)"
+    r"|'(?P<sq>[^'\\\r\n]*)'"
+    r'|"(?P<dq>[^"\\\r\n]*)"'
+    r"|(?P<const>True|False|None))[ \t]*",
+    re.ASCII,
+)
+
+# Operator names are shared by every Compare node, so keep one interned
+# copy of each. Names taken from type(node).__name__ on the ast path are
+# class names and already interned by CPython.
+_OP_MAPPING = {
+    op: sys.intern(name) for op, name in {
+        '>': 'Gt', '<': 'Lt', '>=': 'GtE', '<=': 'LtE',
+        '==': 'Eq', '!=': 'NotEq'
+    }.items()
+}
+_EQ_SENTINEL = _OP_MAPPING['==']
+_IN_OP_NAME = sys.intern('In')
+
+_CONSTANT_LITERALS = {'True': True, 'False': False, 'None': None}
+
+
+# Upper bound on distinct condition strings kept parsed across all visualizers
+AST_CACHE_SIZE = 4096
+
+
+_MISSING = object()
+
+
+class _Node:
+    """Compact, read-only-by-convention node of a parsed condition tree.
+    
+    Only the fields relevant to ``type`` are set; use ``as_dict()`` for the
+    plain dict form (e.g. for JSON export).
+    """
+    
+    # Field order here is the key order of as_dict()
+    __slots__ = ('type', 'left', 'ops', 'comparators', 'op', 'right', 'values',
+                 'operand', 'func', 'args', 'id', 'value', 'attr', 'slice')
+    
+    def __init__(self, type: str, **fields: Any):
+        self.type = type
+        for name, value in fields.items():
+            setattr(self, name, value)
+    
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the tree rooted at this node as nested plain dicts."""
+        result = {}
+        for name in self.__slots__:
+            value = getattr(self, name, _MISSING)
+            if value is _MISSING:
+                continue
+            if isinstance(value, _Node):
+                value = value.as_dict()
+            elif isinstance(value, tuple):
+                value = [v.as_dict() if isinstance(v, _Node) else v for v in value]
+            result[name] = value
+        return result
+    
+    def __repr__(self) -> str:
+        return f"_Node({self.as_dict()!r})"
+
+
+def _compare_node(node: ast.Compare) -> _Node:
+    return _Node(
+        'Compare',
+        left=_ast_to_node(node.left),
+        ops=tuple(op.__class__.__name__ for op in node.ops),
+        comparators=tuple(_ast_to_node(comp) for comp in node.comparators),
+    )
+
+
+def _boolop_node(node: ast.BoolOp) -> _Node:
+    return _Node(
+        'BoolOp',
+        op=node.op.__class__.__name__,
+        values=tuple(_ast_to_node(val) for val in node.values),
+    )
+
+
+def _binop_node(node: ast.BinOp) -> _Node:
+    return _Node(
+        'BinOp',
+        left=_ast_to_node(node.left),
+        op=node.op.__class__.__name__,
+        right=_ast_to_node(node.right),
+    )
+
+
+def _call_node(node: ast.Call) -> _Node:
+    return _Node(
+        'Call',
+        func=_ast_to_node(node.func),
+        args=tuple(_ast_to_node(arg) for arg in node.args),
+    )
+
+
+def _unaryop_node(node: ast.UnaryOp) -> _Node:
+    return _Node('UnaryOp', op=node.op.__class__.__name__, operand=_ast_to_node(node.operand))
+
+
+def _name_node(node: ast.Name) -> _Node:
+    return _Node('Name', id=node.id)
+
+
+def _constant_node(node: ast.Constant) -> _Node:
+    return _Node('Constant', value=node.value)
+
+
+def _attribute_node(node: ast.Attribute) -> _Node:
+    return _Node('Attribute', value=_ast_to_node(node.value), attr=node.attr)
+
+
+def _subscript_node(node: ast.Subscript) -> _Node:
+    index = node.slice
+    if sys.version_info < (3, 9):
+        # Python 3.8 wraps plain subscripts in ast.Index
+        index = getattr(index, 'value', index)
+    return _Node('Subscript', value=_ast_to_node(node.value), slice=_ast_to_node(index))
+
+
+# Node type -> converter; other node types keep only their type name
+_AST_NODE_HANDLERS = {
+    ast.Compare: _compare_node,
+    ast.BoolOp: _boolop_node,
+    ast.BinOp: _binop_node,
+    ast.Call: _call_node,
+    ast.UnaryOp: _unaryop_node,
+    ast.Name: _name_node,
+    ast.Constant: _constant_node,
+    ast.Attribute: _attribute_node,
+    ast.Subscript: _subscript_node,
+}
+
+
+def _ast_to_node(node: ast.AST) -> _Node:
+    """Convert a Python AST node to a condition tree node."""
+    handler = _AST_NODE_HANDLERS.get(type(node))
+    return handler(node) if handler is not None else _Node(type(node).__name__)
+
+
+def _compare_name_to_constant(name: str, op: str, value: Any) -> _Node:
+    """Build the tree for '<name> <op> <constant>'."""
+    return _Node(
+        'Compare',
+        left=_Node('Name', id=name),
+        ops=(op,),
+        comparators=(_Node('Constant', value=value),),
+    )
+
+
+@lru_cache(maxsize=AST_CACHE_SIZE)
+def _parse_condition_cached(condition: str) -> Optional[_Node]:
+    """Parse a condition as a Python expression, or None if it is not one.
+    
+    Results are shared between callers and must be treated as read-only.
+    """
+    # Most rule conditions are a single comparison; build that tree directly
+    match = _TRIVIAL_COMPARE_RE.fullmatch(condition)
+    if match and not keyword.iskeyword(match.group(1)):
+        num, sq, dq, const = match.group('num', 'sq', 'dq', 'const')
+        if num is not None:
+            value = float(num) if '.' in num else int(num)
+        elif const is not None:
+            value = _CONSTANT_LITERALS[const]
+        else:
+            value = sq if sq is not None else dq
+        return _compare_name_to_constant(match.group(1), _OP_MAPPING[match.group(2)], value)
+    
+    try:
+        # Same as ast.parse(mode='eval') minus its Python-level wrapper
+        tree = compile(condition, '<symbolica-cond>', 'eval', ast.PyCF_ONLY_AST)
+    except SyntaxError:
+        return None
+    return _ast_to_node(tree.body)
 
 
 class ASTVisualizer:
@@ -15,159 +213,163 @@ class ASTVisualizer:
     
     def __init__(self, rules: List[Any]):
         self.rules = rules
-        self.ast_cache = {}
+        # Per-rule lookups and get_all_asts() follow reassignments of
+        # self.rules; in-place edits of the list are not detected
+        self._indexed_rules: Optional[List[Any]] = None
+        self._rules_by_id: Dict[str, Any] = {}
+        self._all_asts_cache: Optional[Mapping[str, _Node]] = None
     
-    def parse_condition(self, condition: str) -> Dict[str, Any]:
-        """Parse a condition string into AST representation."""
-        if condition in self.ast_cache:
-            return self.ast_cache[condition]
-        
-        try:
-            # Parse as Python expression
-            tree = ast.parse(condition, mode='eval')
-            ast_dict = self._ast_to_dict(tree.body)
-            self.ast_cache[condition] = ast_dict
-            return ast_dict
-        except SyntaxError:
-            # Handle simple comparison format like "age > 18"
-            return self._parse_simple_condition(condition)
-    
-    def _ast_to_dict(self, node: ast.AST) -> Dict[str, Any]:
-        """Convert AST node to dictionary representation."""
-        result = {'type': node.__class__.__name__}
-        
-        if isinstance(node, ast.Compare):
-            result['left'] = self._ast_to_dict(node.left)
-            result['ops'] = [op.__class__.__name__ for op in node.ops]
-            result['comparators'] = [self._ast_to_dict(comp) for comp in node.comparators]
-        
-        elif isinstance(node, ast.BoolOp):
-            result['op'] = node.op.__class__.__name__
-            result['values'] = [self._ast_to_dict(val) for val in node.values]
-        
-        elif isinstance(node, ast.UnaryOp):
-            result['op'] = node.op.__class__.__name__
-            result['operand'] = self._ast_to_dict(node.operand)
-        
-        elif isinstance(node, ast.Name):
-            result['id'] = node.id
-        
-        elif isinstance(node, ast.Constant):
-            result['value'] = node.value
-        
-        elif isinstance(node, ast.Attribute):
-            result['value'] = self._ast_to_dict(node.value)
-            result['attr'] = node.attr
-        
-        elif isinstance(node, ast.Subscript):
-            result['value'] = self._ast_to_dict(node.value)
-            result['slice'] = self._ast_to_dict(node.slice)
+    def _sync_rules(self) -> None:
+        """Rebuild the rule index and drop the AST mapping if self.rules was reassigned."""
+        if self.rules is not self._indexed_rules:
+            # First rule wins on duplicate IDs
+            self._rules_by_id = {rule.id: rule for rule in reversed(self.rules)}
+            self._all_asts_cache = None
+            self._indexed_rules = self.rules
+    
+    def parse_condition(self, condition: str) -> _Node:
+        """Parse a condition string into AST representation.
         
-        return result
+        Parsed trees are cached process-wide; callers must not mutate them.
+        """
+        node = _parse_condition_cached(condition)
+        if node is not None:
+            return node
+        # Handle simple comparison format like "age > 18"
+        return self._parse_simple_condition(condition)
     
-    def _parse_simple_condition(self, condition: str) -> Dict[str, Any]:
+    def _parse_simple_condition(self, condition: str) -> _Node:
         """Parse simple conditions like 'age > 18'."""
         condition = condition.strip()
         
-        # Handle basic comparisons
-        for op in ['>=', '<=', '==', '!=', '>', '<']:
-            if op in condition:
-                left, right = condition.split(op, 1)
-                return {
-                    'type': 'Compare',
-                    'left': {'type': 'Name', 'id': left.strip()},
-                    'ops': [self._op_to_ast_name(op)],
-                    'comparators': [{'type': 'Constant', 'value': self._parse_value(right.strip())}]
-                }
-        
-        # Handle 'in' operations
-        if ' in ' in condition:
-            left, right = condition.split(' in ', 1)
-            return {
-                'type': 'Compare',
-                'left': {'type': 'Name', 'id': left.strip()},
-                'ops': ['In'],
-                'comparators': [{'type': 'Constant', 'value': self._parse_value(right.strip())}]
-            }
+        # Split at the first comparison or ' in ' operator in a single scan;
+        # the pattern consumes the whitespace around the operator, so both
+        # sides come back already stripped
+        match = _SIMPLE_CONDITION_RE.match(condition)
+        if match:
+            left, op, right = match.groups()
+            return _compare_name_to_constant(
+                left,
+                _IN_OP_NAME if op == ' in ' else self._op_to_ast_name(op),
+                self._parse_value(right),
+            )
         
         # Default to simple name
-        return {'type': 'Name', 'id': condition}
+        return _Node('Name', id=condition)
     
     def _op_to_ast_name(self, op: str) -> str:
         """Convert operator string to AST class name."""
-        mapping = {
-            '>': 'Gt', '<': 'Lt', '>=': 'GtE', '<=': 'LtE',
-            '==': 'Eq', '!=': 'NotEq'
-        }
-        return mapping.get(op, 'Eq')
+        return _OP_MAPPING.get(op, _EQ_SENTINEL)
     
     def _parse_value(self, value: str) -> Any:
-        """Parse string value to appropriate type."""
-        value = value.strip()
+        """Parse an already-stripped string value to appropriate type."""
+        assert value == value.strip(), "callers pass stripped values"
         
-        # Try to parse as number
+        # Numbers, quoted strings and True/False/None in a single pass
         try:
-            if '.' in value:
-                return float(value)
-            return int(value)
-        except ValueError:
+            return ast.literal_eval(value)
+        except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
             pass
         
-        # Try to parse as boolean
-        if value.lower() in ('true', 'false'):
-            return value.lower() == 'true'
+        # Leading-zero integers like 07, which literal_eval rejects
+        digits = value[1:] if value[:1] in ('+', '-') else value
+        if digits.isdecimal():
+            return int(value)
+        
+        # Lower-case booleans as written in YAML-style conditions
+        lowered = value.lower()
+        if lowered in ('true', 'false'):
+            return lowered == 'true'
         
-        # Remove quotes if present
-        if (value.startswith('"') and value.endswith('"')) or \
-           (value.startswith("'") and value.endswith("'")):
+        # Remove quotes literal_eval rejected (e.g. 'it's')
+        if value[:1] in ('"', "'") and value[-1:] == value[:1]:
             return value[1:-1]
         
         return value
     
-    def get_ast_tree(self, rule_id: str) -> Optional[Dict[str, Any]]:
+    def get_ast_tree(self, rule_id: str) -> Optional[_Node]:
         """Get AST tree for a specific rule."""
-        for rule in self.rules:
-            if rule.id == rule_id:
-                return self.parse_condition(rule.condition)
-        return None
+        self._sync_rules()
+        rule = self._rules_by_id.get(rule_id)
+        return self.parse_condition(rule.condition) if rule is not None else None
+    
+    def get_all_asts(self) -> Mapping[str, _Node]:
+        """Get AST trees for all rules as a read-only mapping."""
+        self._sync_rules()
+        if self._all_asts_cache is None:
+            self._all_asts_cache = MappingProxyType({
+                rule.id: self.parse_condition(rule.condition)
+                for rule in self.rules
+            })
+        return self._all_asts_cache
     
-    def get_all_asts(self) -> Dict[str, Dict[str, Any]]:
-        """Get AST trees for all rules."""
-        return {
-            rule.id: self.parse_condition(rule.condition)
-            for rule in self.rules
-        }
+    def to_text_tree(self, node: _Node, indent: int = 0) -> str:
+        """Convert an AST tree to readable text tree."""
+        lines: List[str] = []
+        self._emit_text_tree(node, indent, lines)
+        return "\n".join(lines)
     
-    def to_text_tree(self, ast_dict: Dict[str, Any], indent: int = 0) -> str:
-        """Convert AST dictionary to readable text tree."""
+    def _emit_text_tree(self, node: _Node, indent: int, lines: List[str]) -> None:
+        """Append the text tree lines for a node to an accumulator."""
         spaces = "  " * indent
-        node_type = ast_dict.get('type', 'Unknown')
+        node_type = node.type
         
         if node_type == 'Compare':
-            left = self.to_text_tree(ast_dict['left'], indent + 1)
-            ops = " ".join(ast_dict.get('ops', []))
+            lines.append(f"{spaces}Compare:")
+            self._emit_text_tree(node.left, indent + 1, lines)
+            ops = " ".join(getattr(node, 'ops', ()))
             comparators = " ".join([
                 self.to_text_tree(comp, 0) 
-                for comp in ast_dict.get('comparators', [])
+                for comp in getattr(node, 'comparators', ())
             ])
-            return f"{spaces}Compare:\n{left}\n{spaces}  Ops: {ops}\n{spaces}  Values: {comparators}"
+            lines.append(f"{spaces}  Ops: {ops}")
+            lines.append(f"{spaces}  Values: {comparators}")
         
         elif node_type == 'BoolOp':
-            op = ast_dict.get('op', 'Unknown')
-            values = "\n".join([
-                self.to_text_tree(val, indent + 1)
-                for val in ast_dict.get('values', [])
-            ])
-            return f"{spaces}{op}:\n{values}"
+            lines.append(f"{spaces}{getattr(node, 'op', 'Unknown')}:")
+            for val in getattr(node, 'values', ()):
+                self._emit_text_tree(val, indent + 1, lines)
         
         elif node_type == 'Name':
-            return f"{spaces}Field: {ast_dict.get('id', 'unknown')}"
+            lines.append(f"{spaces}Field: {getattr(node, 'id', 'unknown')}")
         
         elif node_type == 'Constant':
-            return f"{spaces}Value: {ast_dict.get('value', 'unknown')}"
+            lines.append(f"{spaces}Value: {getattr(node, 'value', 'unknown')}")
+        
+        elif node_type == 'Attribute':
+            lines.append(f"{spaces}Attr: {getattr(node, 'attr', 'unknown')} of")
+            self._emit_text_tree(node.value, indent + 1, lines)
+        
+        elif node_type == 'Subscript':
+            lines.append(f"{spaces}Subscript:")
+            self._emit_text_tree(node.value, indent + 1, lines)
+            lines.append(f"{spaces}  Index: {self.to_text_tree(node.slice, 0)}")
+        
+        elif node_type == 'UnaryOp':
+            lines.append(f"{spaces}{getattr(node, 'op', 'Unknown')}:")
+            self._emit_text_tree(node.operand, indent + 1, lines)
+        
+        elif node_type == 'BinOp':
+            lines.append(f"{spaces}{getattr(node, 'op', 'Unknown')}:")
+            self._emit_text_tree(node.left, indent + 1, lines)
+            self._emit_text_tree(node.right, indent + 1, lines)
+        
+        elif node_type == 'Call':
+            func = node.func
+            if func.type == 'Name':
+                lines.append(f"{spaces}Call: {func.id}")
+            else:
+                lines.append(f"{spaces}Call:")
+                self._emit_text_tree(func, indent + 1, lines)
+            for arg in node.args:
+                self._emit_text_tree(arg, indent + 1, lines)
         
         else:
-            return f"{spaces}{node_type}: {json.dumps(ast_dict, indent=2)}"
+            # Node kinds without a renderer (lists, comprehensions, ...) are dumped raw
+            if node_type not in _UNRENDERED_NODE_TYPES:
+                _UNRENDERED_NODE_TYPES.add(node_type)
+                logger.debug("No text renderer for AST node type %s", node_type)
+            lines.append(f"{spaces}{node_type}: {json.dumps(node.as_dict(), indent=2)}")
     
     def print_rule_ast(self, rule_id: str) -> None:
         """Print AST tree for a specific rule."""
@@ -5,90 +5,136 @@ DAG Visualizer for Rule Dependencies
 Visualizes rule dependencies and execution order as a directed acyclic graph.
 """
 
+import re
+import sys
 from typing import Dict, List, Set, Tuple, Any, Optional
 from collections import defaultdict, deque
 
 
+# Identifier-like tokens in a condition; never starts with a digit
+_FIELD_RE = re.compile(r'\b[a-zA-Z_][a-zA-Z0-9_]*\b')
+
+# Operators and literals that look like identifiers but are not fields
+_KEYWORDS = frozenset({'and', 'or', 'not', 'in', 'true', 'false', 'True', 'False'})
+
+
 class DAGVisualizer:
     """Visualizes rule dependencies and execution order."""
     
     def __init__(self, rules: List[Any]):
         self.rules = rules
-        self.rule_map = {rule.id: rule for rule in rules}
+        # Rule IDs are interned once here and in _build_dependencies, so the
+        # adjacency dicts and sets below share one string object per ID
+        self.rule_map = {sys.intern(rule.id): rule for rule in rules}
+        self._priority_of = {rule_id: rule.priority for rule_id, rule in self.rule_map.items()}
+        # Triggers per rule ID (last rule wins on duplicate IDs, like rule_map)
+        self._triggers = {
+            rule_id: tuple(sys.intern(target) for target in getattr(rule, 'triggers', ()))
+            for rule_id, rule in self.rule_map.items()
+        }
+        # (triggering rule, triggered rule) pairs, for styling graph edges
+        self._trigger_edges = {
+            (rule_id, target)
+            for rule_id, targets in self._triggers.items()
+            for target in targets
+        }
         self.dependencies = self._build_dependencies()
+        self._dependents = self._build_dependents()
         self.execution_order = self._compute_execution_order()
+        # Rules and dependencies are fixed after construction
+        self._graph_cache: Optional[Dict[str, Dict[str, Any]]] = None
+        self._critical_path: Optional[List[str]] = None
+        self._stats_cache: Optional[Dict[str, Any]] = None
+        self._graphviz_cache: Optional[str] = None
+        self._deps_sorted: Optional[Dict[str, Tuple[str, ...]]] = None
+        self._fields_cache: Optional[Dict[str, Dict[str, Set[str]]]] = None
     
     def _build_dependencies(self) -> Dict[str, Set[str]]:
         """Build dependency graph based on rule priorities, conditions, and chaining."""
-        dependencies = defaultdict(set)
+        dependencies: Dict[str, Set[str]] = {}
         
         # Sort rules by priority (higher priority = executed first)
         sorted_rules = sorted(self.rules, key=lambda r: r.priority, reverse=True)
+        sorted_ids = [sys.intern(rule.id) for rule in sorted_rules]
+        
+        # A rule depends on any higher priority rule whose actions set fields
+        # its condition reads. writers[field] is a bitmask over positions in
+        # sorted_rules of the rules seen so far that set that field, so each
+        # rule ORs the masks of its condition fields instead of intersecting
+        # field sets with every earlier rule.
+        writers: Dict[str, int] = defaultdict(int)
         
         for i, rule in enumerate(sorted_rules):
-            # Rules with lower priority depend on higher priority rules
-            for j in range(i):
-                if self._rules_conflict(rule, sorted_rules[j]):
-                    dependencies[rule.id].add(sorted_rules[j].id)
+            mask = 0
+            for field in self._extract_fields_from_condition(rule.condition):
+                mask |= writers.get(field, 0)
             
-            # Also check for field dependencies
-            rule_fields = self._extract_fields_from_condition(rule.condition)
-            for other_rule in sorted_rules[:i]:
-                other_actions = self._extract_fields_from_actions(other_rule.actions)
-                if rule_fields.intersection(other_actions):
-                    dependencies[rule.id].add(other_rule.id)
-        
-        # Add explicit rule chaining dependencies
-        rule_map = {rule.id: rule for rule in self.rules}
+            if mask:
+                deps = dependencies.setdefault(sorted_ids[i], set())
+                while mask:
+                    lowest = mask & -mask
+                    deps.add(sorted_ids[lowest.bit_length() - 1])
+                    mask ^= lowest
+            
+            bit = 1 << i
+            for field in self._extract_fields_from_actions(rule.actions):
+                writers[field] |= bit
+        
+        # Add explicit rule chaining dependencies; every rule object counts
+        # here, including ones shadowed by a later duplicate ID
         for rule in self.rules:
-            for triggered_rule_id in getattr(rule, 'triggers', []):
-                if triggered_rule_id in rule_map:
+            rule_id = sys.intern(rule.id)
+            for triggered_rule_id in getattr(rule, 'triggers', ()):
+                if triggered_rule_id in self.rule_map:
                     # Triggered rule depends on the triggering rule
-                    dependencies[triggered_rule_id].add(rule.id)
+                    triggered_rule_id = sys.intern(triggered_rule_id)
+                    dependencies.setdefault(triggered_rule_id, set()).add(rule_id)
         
-        return dict(dependencies)
+        return dependencies
     
-    def _rules_conflict(self, rule1: Any, rule2: Any) -> bool:
-        """Check if two rules potentially conflict."""
-        # Simple heuristic: if they have overlapping field access
-        fields1 = self._extract_fields_from_condition(rule1.condition)
-        fields2 = self._extract_fields_from_condition(rule2.condition)
-        
-        actions1 = self._extract_fields_from_actions(rule1.actions)
-        actions2 = self._extract_fields_from_actions(rule2.actions)
-        
-        # Check if rule1's conditions depend on rule2's actions
-        return bool(fields1.intersection(actions2))
+    def _build_dependents(self) -> Dict[str, List[str]]:
+        """Invert the dependency graph: rule ID -> IDs of rules that depend on it."""
+        dependents = defaultdict(list)
+        for rule_id, deps in self.dependencies.items():
+            for dep in deps:
+                dependents[dep].append(rule_id)
+        return dict(dependents)
     
     def _extract_fields_from_condition(self, condition: str) -> Set[str]:
         """Extract field names from a condition string."""
-        import re
-        # Simple regex to find field references
-        fields = re.findall(r'\b([a-zA-Z_][a-zA-Z0-9_]*)\b', condition)
-        # Filter out common operators and keywords
-        keywords = {'and', 'or', 'not', 'in', 'true', 'false', 'True', 'False'}
-        return {f for f in fields if f not in keywords and not f.isdigit()}
+        return {f for f in _FIELD_RE.findall(condition) if f not in _KEYWORDS}
     
     def _extract_fields_from_actions(self, actions: Dict[str, Any]) -> Set[str]:
         """Extract field names from actions dictionary."""
         return set(actions.keys())
     
+    def extract_all_fields(self) -> Dict[str, Dict[str, Set[str]]]:
+        """Fields read ('condition') and set ('actions') by each rule.
+        
+        Extracted in one pass and shared between calls; treat the result as
+        read-only. The first rule wins on duplicate IDs.
+        """
+        if self._fields_cache is None:
+            self._fields_cache = {
+                rule.id: {
+                    'condition': self._extract_fields_from_condition(rule.condition),
+                    'actions': self._extract_fields_from_actions(rule.actions),
+                }
+                for rule in reversed(self.rules)
+            }
+        return self._fields_cache
+    
     def _compute_execution_order(self) -> List[List[str]]:
         """Compute topological execution order (levels)."""
         # Compute in-degrees
-        in_degree = defaultdict(int)
-        all_rules = set(rule.id for rule in self.rules)
-        
-        for rule_id in all_rules:
-            in_degree[rule_id] = 0
-        
-        for rule_id, deps in self.dependencies.items():
-            for dep in deps:
-                in_degree[rule_id] += 1
+        in_degree = {
+            rule_id: len(self.dependencies.get(rule_id, ()))
+            for rule_id in self.rule_map
+        }
         
         # Topological sort by levels
         levels = []
-        queue = deque([rule_id for rule_id in all_rules if in_degree[rule_id] == 0])
+        queue = deque([rule_id for rule_id, degree in in_degree.items() if degree == 0])
         
         while queue:
             current_level = []
@@ -97,88 +143,117 @@ class DAGVisualizer:
                 current_level.append(rule_id)
                 
                 # Reduce in-degree for dependent rules
-                for dependent in all_rules:
-                    if rule_id in self.dependencies.get(dependent, set()):
-                        in_degree[dependent] -= 1
-                        if in_degree[dependent] == 0:
-                            queue.append(dependent)
+                for dependent in self._dependents.get(rule_id, ()):
+                    in_degree[dependent] -= 1
+                    if in_degree[dependent] == 0:
+                        queue.append(dependent)
             
             if current_level:
                 # Sort by priority within level
-                current_level.sort(key=lambda r: self.rule_map[r].priority, reverse=True)
+                current_level.sort(key=self._priority_of.__getitem__, reverse=True)
                 levels.append(current_level)
         
+        # Rule ID -> level index; rules left out by a cycle have no entry
+        self._rule_level = {
+            rule_id: level
+            for level, rule_ids in enumerate(levels)
+            for rule_id in rule_ids
+        }
+        
         return levels
     
     def get_dependency_graph(self) -> Dict[str, Dict[str, Any]]:
-        """Get the full dependency graph with metadata."""
+        """Get the full dependency graph with metadata.
+        
+        The graph is built once and shared between calls; treat it as read-only.
+        """
+        if self._graph_cache is not None:
+            return self._graph_cache
+        
         graph = {}
         
         for rule in self.rules:
             graph[rule.id] = {
                 'rule': rule,
                 'dependencies': list(self.dependencies.get(rule.id, set())),
-                'dependents': [
-                    r_id for r_id, deps in self.dependencies.items() 
-                    if rule.id in deps
-                ],
+                'dependents': list(self._dependents.get(rule.id, ())),
                 'level': self._get_rule_level(rule.id),
                 'priority': rule.priority
             }
         
+        self._graph_cache = graph
         return graph
     
+    def _sorted_dependencies(self) -> Dict[str, Tuple[str, ...]]:
+        """Each rule's dependencies in sorted order, computed once for display."""
+        if self._deps_sorted is None:
+            self._deps_sorted = {
+                rule_id: tuple(sorted(deps))
+                for rule_id, deps in self.dependencies.items()
+            }
+        return self._deps_sorted
+    
     def _get_rule_level(self, rule_id: str) -> int:
         """Get the execution level for a rule."""
-        for level, rules in enumerate(self.execution_order):
-            if rule_id in rules:
-                return level
-        return -1
+        return self._rule_level.get(rule_id, -1)
     
     def print_execution_order(self) -> None:
         """Print the execution order by levels."""
-        print("\nRule Execution Order:")
-        print("=" * 50)
+        lines = ["\nRule Execution Order:", "=" * 50]
+        deps_sorted = self._sorted_dependencies()
         
         for level, rules in enumerate(self.execution_order):
-            print(f"\nLevel {level}:")
+            lines.append(f"\nLevel {level}:")
             for rule_id in rules:
                 rule = self.rule_map[rule_id]
-                deps = self.dependencies.get(rule_id, set())
-                deps_str = f" (depends on: {', '.join(sorted(deps))})" if deps else ""
-                print(f"  - {rule_id} [priority: {rule.priority}]{deps_str}")
+                deps = deps_sorted.get(rule_id)
+                deps_str = f" (depends on: {', '.join(deps)})" if deps else ""
+                lines.append(f"  - {rule_id} [priority: {rule.priority}]{deps_str}")
+        
+        self._write_lines(lines)
     
     def print_dependency_graph(self) -> None:
         """Print the full dependency graph including rule chaining."""
-        print("\nRule Dependency Graph:")
-        print("=" * 50)
+        lines = ["\nRule Dependency Graph:", "=" * 50]
         
         graph = self.get_dependency_graph()
+        deps_sorted = self._sorted_dependencies()
         
         for rule_id in sorted(graph.keys()):
             node = graph[rule_id]
-            rule = node['rule']
             
-            print(f"\n{rule_id}:")
-            print(f"  Priority: {node['priority']}")
-            print(f"  Level: {node['level']}")
+            lines.append(f"\n{rule_id}:")
+            lines.append(f"  Priority: {node['priority']}")
+            lines.append(f"  Level: {node['level']}")
             
             # Show triggers (rules this one will trigger)
-            triggers = getattr(rule, 'triggers', [])
+            triggers = self._triggers[rule_id]
             if triggers:
-                print(f"  Triggers: {', '.join(triggers)}")
+                lines.append(f"  Triggers: {', '.join(triggers)}")
             
             if node['dependencies']:
-                print(f"  Depends on: {', '.join(sorted(node['dependencies']))}")
+                lines.append(f"  Depends on: {', '.join(deps_sorted[rule_id])}")
             
             if node['dependents']:
-                print(f"  Required by: {', '.join(sorted(node['dependents']))}")
+                lines.append(f"  Required by: {', '.join(sorted(node['dependents']))}")
             
             if not node['dependencies'] and not node['dependents'] and not triggers:
-                print("  Independent rule")
+                lines.append("  Independent rule")
+        
+        self._write_lines(lines)
+    
+    def _write_lines(self, lines: List[str]) -> None:
+        """Write report lines to stdout in one call (same output as printing each)."""
+        sys.stdout.write("\n".join(lines) + "\n")
     
     def to_graphviz(self) -> str:
         """Generate Graphviz DOT format for visualization including rule chaining."""
+        if self._graphviz_cache is None:
+            self._graphviz_cache = self._build_graphviz()
+        return self._graphviz_cache
+    
+    def _build_graphviz(self) -> str:
+        """Render the DOT source for to_graphviz()."""
         lines = ["digraph RuleDependencies {"]
         lines.append("  rankdir=TB;")
         lines.append("  node [shape=box, style=rounded];")
@@ -192,7 +267,7 @@ class DAGVisualizer:
                 rule = self.rule_map[rule_id]
                 label = f"{rule_id}\\npriority: {rule.priority}"
                 # Add triggers info to label if present
-                triggers = getattr(rule, 'triggers', [])
+                triggers = self._triggers[rule_id]
                 if triggers:
                     label += f"\\ntriggers: {len(triggers)}"
                 lines.append(f'  "{rule_id}" [label="{label}", fillcolor="{color}", style="filled,rounded"];')
@@ -201,10 +276,7 @@ class DAGVisualizer:
         for rule_id, deps in self.dependencies.items():
             for dep in deps:
                 # Check if this is a trigger relationship
-                dep_rule = self.rule_map.get(dep)
-                is_trigger = dep_rule and rule_id in getattr(dep_rule, 'triggers', [])
-                
-                if is_trigger:
+                if (dep, rule_id) in self._trigger_edges:
                     # Trigger relationships use dashed blue arrows
                     lines.append(f'  "{dep}" -> "{rule_id}" [color=blue, style=dashed, label="triggers"];')
                 else:
@@ -229,6 +301,45 @@ class DAGVisualizer:
     
     def get_critical_path(self) -> List[str]:
         """Get the critical path (longest dependency chain)."""
+        return list(self._cached_critical_path())
+    
+    def _cached_critical_path(self) -> List[str]:
+        """Compute the critical path once; callers must not mutate the result."""
+        if self._critical_path is None:
+            if len(self._rule_level) == len(self.rule_map):
+                self._critical_path = self._longest_path_in_order()
+            else:
+                # Some rules sit on a cycle and never got a level
+                self._critical_path = self._longest_simple_path()
+        return self._critical_path
+    
+    def _longest_path_in_order(self) -> List[str]:
+        """Longest chain by DP over the level order (acyclic graphs only)."""
+        length: Dict[str, int] = {}
+        parent: Dict[str, Optional[str]] = {}
+        tail = None
+        
+        # Dependencies always sit in earlier levels than their dependents
+        for rule_ids in self.execution_order:
+            for rule_id in rule_ids:
+                best, best_dep = 0, None
+                for dep in self.dependencies.get(rule_id, ()):
+                    if length[dep] > best:
+                        best, best_dep = length[dep], dep
+                length[rule_id] = best + 1
+                parent[rule_id] = best_dep
+                if tail is None or length[rule_id] > length[tail]:
+                    tail = rule_id
+        
+        path = []
+        while tail is not None:
+            path.append(tail)
+            tail = parent[tail]
+        path.reverse()
+        return path
+    
+    def _longest_simple_path(self) -> List[str]:
+        """Longest chain by exhaustive search; used only when the graph has cycles."""
         def dfs_longest_path(rule_id: str, visited: Set[str]) -> List[str]:
             if rule_id in visited:
                 return []
@@ -237,7 +348,7 @@ class DAGVisualizer:
             longest = []
             
             for dep in self.dependencies.get(rule_id, set()):
-                path = dfs_longest_path(dep, visited.copy())
+                path = dfs_longest_path(dep, visited)
                 if len(path) > len(longest):
                     longest = path
             
@@ -256,33 +367,42 @@ class DAGVisualizer:
         """Print the critical path analysis."""
         path = self.get_critical_path()
         
-        print("\nCritical Path (Longest Dependency Chain):")
-        print("=" * 50)
+        lines = ["\nCritical Path (Longest Dependency Chain):", "=" * 50]
         
         if not path:
-            print("No dependencies found - all rules are independent")
-            return
-        
-        for i, rule_id in enumerate(path):
-            rule = self.rule_map[rule_id]
-            arrow = " -> " if i < len(path) - 1 else ""
-            print(f"{rule_id} [priority: {rule.priority}]{arrow}", end="")
+            lines.append("No dependencies found - all rules are independent")
+        else:
+            lines.append(" -> ".join(
+                f"{rule_id} [priority: {self.rule_map[rule_id].priority}]" for rule_id in path
+            ))
+            lines.append(f"\nTotal chain length: {len(path)} rules")
         
-        print(f"\n\nTotal chain length: {len(path)} rules")
+        self._write_lines(lines)
     
     def get_stats(self) -> Dict[str, Any]:
         """Get dependency statistics."""
-        graph = self.get_dependency_graph()
+        if self._stats_cache is None:
+            self._stats_cache = self._compute_stats()
+        return dict(self._stats_cache)
+    
+    def _compute_stats(self) -> Dict[str, Any]:
+        """Compute the statistics returned by get_stats()."""
+        # Read straight from the adjacency maps; no need to build the graph
+        dependency_counts = [len(deps) for deps in self.dependencies.values()]
+        independent_rules = sum(
+            1 for rule_id in self.rule_map
+            if not self.dependencies.get(rule_id) and not self._dependents.get(rule_id)
+        )
         
         return {
             'total_rules': len(self.rules),
-            'total_dependencies': sum(len(deps) for deps in self.dependencies.values()),
+            'total_dependencies': sum(dependency_counts),
             'execution_levels': len(self.execution_order),
-            'independent_rules': len([r for r in graph.values() 
-                                   if not r['dependencies'] and not r['dependents']]),
-            'max_dependencies': max([len(deps) for deps in self.dependencies.values()] + [0]),
-            'critical_path_length': len(self.get_critical_path()),
-            'parallelization_potential': sum(len(level) for level in self.execution_order) / len(self.execution_order) if self.execution_order else 0
+            'independent_rules': independent_rules,
+            'max_dependencies': max(dependency_counts, default=0),
+            'critical_path_length': len(self._cached_critical_path()),
+            # Every levelled rule appears in exactly one level
+            'parallelization_potential': len(self._rule_level) / len(self.execution_order) if self.execution_order else 0
         }
     
     def print_stats(self) -> None:
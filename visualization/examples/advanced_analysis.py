@@ -9,6 +9,7 @@ with multiple dependencies, conditional chains, and parallelization analysis.
 
 import sys
 import os
+from collections import defaultdict
 
 # Add symbolica to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
@@ -172,12 +173,9 @@ def analyze_complex_rules():
     print("\n4. DEPENDENCY ANALYSIS BY TAGS")
     print("-" * 30)
     
-    tag_groups = {}
+    tag_groups = defaultdict(list)
     for rule in engine.rules:
-        tags = getattr(rule, 'tags', [])
-        for tag in tags:
-            if tag not in tag_groups:
-                tag_groups[tag] = []
+        for tag in getattr(rule, 'tags', []):
             tag_groups[tag].append(rule.id)
     
     for tag, rules in sorted(tag_groups.items()):
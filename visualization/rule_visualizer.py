@@ -5,17 +5,96 @@ Rule Visualizer - Main Interface
 Unified interface for visualizing rule structure, dependencies, and execution order.
 """
 
+import functools
+import html
+import io
 import json
-import sys
 import os
-from typing import Dict, List, Any, Optional
-
-# Add symbolica to path if running from visualization directory
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+import urllib.parse
+from typing import Dict, List, Any, Optional, TextIO
 
 from .ast_visualizer import ASTVisualizer
 from .dag_visualizer import DAGVisualizer
 
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json encodes the same data
+    orjson = None
+
+
+# Every value interpolated into the report is element text, never an
+# attribute, so quotes are left as they are
+_escape = functools.partial(html.escape, quote=False)
+
+# Static parts of the HTML report around the generated sections
+_REPORT_HEAD = """
+<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Symbolica Rule Analysis Report</title>
+    <style>
+        body { font-family: Arial, sans-serif; margin: 20px; background-color: #f5f5f5; }
+        .container { max-width: 1200px; margin: 0 auto; background-color: white; padding: 20px; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }
+        h1, h2, h3 { color: #333; }
+        .summary { background-color: #e8f4fd; padding: 15px; border-radius: 5px; margin-bottom: 20px; }
+        .rule-card { border: 1px solid #ddd; margin: 10px 0; padding: 15px; border-radius: 5px; background-color: #fafafa; }
+        .execution-level { background-color: #f0f8ff; padding: 10px; margin: 5px 0; border-left: 4px solid #007acc; }
+        .dependency { color: #666; font-style: italic; }
+        .ast-tree { background-color: #f9f9f9; border: 1px solid #ddd; padding: 10px; font-family: monospace; white-space: pre-wrap; }
+        .stats-grid { display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 15px; margin: 20px 0; }
+        .stat-card { background-color: #f8f9fa; padding: 15px; border-radius: 5px; text-align: center; }
+        .stat-value { font-size: 2em; font-weight: bold; color: #007acc; }
+        .critical-path { background-color: #fff3cd; border: 1px solid #ffeaa7; padding: 10px; border-radius: 5px; }
+        .graphviz-note { background-color: #d4edda; border: 1px solid #c3e6cb; padding: 10px; border-radius: 5px; margin: 15px 0; }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <h1>Symbolica Rule Analysis Report</h1>
+        """
+
+# (statistics key, label, format spec) for each card of the summary grid
+_SUMMARY_STATS = (
+    ('total_rules', 'Total Rules', ''),
+    ('execution_levels', 'Execution Levels', ''),
+    ('total_dependencies', 'Dependencies', ''),
+    ('parallelization_potential', 'Avg Rules/Level', '.1f'),
+)
+
+_STAT_CARD = """                <div class="stat-card">
+                    <div class="stat-value">{value}</div>
+                    <div>{label}</div>
+                </div>"""
+
+_REPORT_TAIL = """
+        
+        <div style="margin-top: 30px; padding-top: 20px; border-top: 1px solid #ddd; color: #666; text-align: center;">
+            Generated by Symbolica Rule Visualizer
+        </div>
+    </div>
+</body>
+</html>"""
+
+
+def _dump_json(data: Any) -> bytes:
+    """Serialize export data as indented JSON, using orjson when installed."""
+    if orjson is not None:
+        try:
+            # Dataclasses (e.g. Rule) and datetimes go through default=str,
+            # as they do with the stdlib encoder
+            return orjson.dumps(
+                data,
+                default=str,
+                option=(orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+                        | orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_PASSTHROUGH_DATETIME),
+            )
+        except orjson.JSONEncodeError:
+            # e.g. integers beyond 64 bits; the stdlib encoder handles those
+            pass
+    return json.dumps(data, indent=2, default=str).encode('utf-8')
+
 
 class RuleVisualizer:
     """Main interface for rule visualization and analysis."""
@@ -31,8 +110,78 @@ class RuleVisualizer:
             self.engine = None
             self.rules = engine_or_rules
         
-        self.ast_viz = ASTVisualizer(self.rules)
-        self.dag_viz = DAGVisualizer(self.rules)
+        # First rule wins on duplicate IDs, as with a linear scan
+        self._rules_by_id = {rule.id: rule for rule in reversed(self.rules)}
+        
+        # Derived results reused across reports. The rule set is treated as
+        # fixed; call invalidate_cache() after changing it.
+        self._dep_graph_cache: Optional[Dict[str, Dict[str, List[str]]]] = None
+        self._execution_summary_cache: Optional[Dict[str, Any]] = None
+        self._rule_analysis_cache: Dict[str, Dict[str, Any]] = {}
+    
+    def invalidate_cache(self) -> None:
+        """Drop cached analyses and rebuild the visualizers after rules change.
+        
+        Engine-backed visualizers re-read the engine's rules first.
+        """
+        if self.engine is not None:
+            self.rules = self.engine.rules
+        self._rules_by_id = {rule.id: rule for rule in reversed(self.rules)}
+        # Rebuilt from the current rules on next access
+        self.__dict__.pop('ast_viz', None)
+        self.__dict__.pop('dag_viz', None)
+        self.__dict__.pop('_deps_display', None)
+        self.__dict__.pop('_rules_by_priority', None)
+        self.__dict__.pop('_escaped_ids', None)
+        self.__dict__.pop('_level_rules_display', None)
+        self._dep_graph_cache = None
+        self._execution_summary_cache = None
+        self._rule_analysis_cache.clear()
+    
+    @functools.cached_property
+    def ast_viz(self) -> ASTVisualizer:
+        """AST visualizer for the rules, built on first use."""
+        return ASTVisualizer(self.rules)
+    
+    @functools.cached_property
+    def dag_viz(self) -> DAGVisualizer:
+        """Dependency visualizer for the rules, built on first use."""
+        return DAGVisualizer(self.rules)
+    
+    @functools.cached_property
+    def _rules_by_priority(self) -> List[Any]:
+        """Rules from highest to lowest priority (stable for equal priorities)."""
+        return sorted(self.rules, key=lambda r: r.priority, reverse=True)
+    
+    @functools.cached_property
+    def _escaped_ids(self) -> Dict[str, str]:
+        """HTML-escaped form of every rule ID, for the report sections."""
+        return {rule.id: _escape(rule.id) for rule in self.rules}
+    
+    @functools.cached_property
+    def _deps_display(self) -> Dict[str, str]:
+        """Sorted, comma-joined, HTML-escaped dependencies of each rule that has any."""
+        escaped_ids = self._escaped_ids
+        return {
+            rule_id: ', '.join([escaped_ids[dep] for dep in deps])
+            for rule_id, deps in self.dag_viz._sorted_dependencies().items()
+            if deps
+        }
+    
+    @functools.cached_property
+    def _level_rules_display(self) -> Dict[int, str]:
+        """Comma-joined, HTML-escaped rule IDs of each execution level."""
+        escaped_ids = self._escaped_ids
+        return {
+            level: ', '.join([escaped_ids[rule_id] for rule_id in rules])
+            for level, rules in enumerate(self.dag_viz.execution_order)
+        }
+    
+    def _get_dep_graph(self) -> Dict[str, Dict[str, List[str]]]:
+        """Dependency graph of all rules, computed on first use."""
+        if self._dep_graph_cache is None:
+            self._dep_graph_cache = self.dag_viz.get_dependency_graph()
+        return self._dep_graph_cache
     
     def show_ast(self, rule_id: Optional[str] = None) -> None:
         """Show AST visualization for a specific rule or all rules."""
@@ -49,15 +198,23 @@ class RuleVisualizer:
         self.dag_viz.print_stats()
     
     def analyze_rule(self, rule_id: str) -> Dict[str, Any]:
-        """Detailed analysis of a specific rule."""
-        rule = next((r for r in self.rules if r.id == rule_id), None)
+        """Detailed analysis of a specific rule.
+        
+        Results are cached until invalidate_cache(); treat them as read-only.
+        """
+        cached = self._rule_analysis_cache.get(rule_id)
+        if cached is not None:
+            return cached
+        
+        rule = self._rules_by_id.get(rule_id)
         if not rule:
             return {'error': f'Rule {rule_id} not found'}
         
         ast_tree = self.ast_viz.get_ast_tree(rule_id)
-        dep_graph = self.dag_viz.get_dependency_graph()
+        dep_graph = self._get_dep_graph()
+        fields = self.dag_viz.extract_all_fields()[rule_id]
         
-        return {
+        analysis = {
             'rule': {
                 'id': rule.id,
                 'priority': rule.priority,
@@ -65,19 +222,27 @@ class RuleVisualizer:
                 'actions': rule.actions,
                 'tags': getattr(rule, 'tags', [])
             },
-            'ast': ast_tree,
+            'ast': ast_tree.as_dict() if ast_tree is not None else None,
             'dependencies': dep_graph.get(rule_id, {}),
-            'condition_fields': list(self.dag_viz._extract_fields_from_condition(rule.condition)),
-            'action_fields': list(self.dag_viz._extract_fields_from_actions(rule.actions))
+            'condition_fields': list(fields['condition']),
+            'action_fields': list(fields['actions'])
         }
+        self._rule_analysis_cache[rule_id] = analysis
+        return analysis
     
     def get_execution_summary(self) -> Dict[str, Any]:
-        """Get summary of execution order and dependencies."""
+        """Get summary of execution order and dependencies.
+        
+        Results are cached until invalidate_cache(); treat them as read-only.
+        """
+        if self._execution_summary_cache is not None:
+            return self._execution_summary_cache
+        
         stats = self.dag_viz.get_stats()
         execution_order = self.dag_viz.execution_order
         critical_path = self.dag_viz.get_critical_path()
         
-        return {
+        self._execution_summary_cache = {
             'statistics': stats,
             'execution_levels': execution_order,
             'critical_path': critical_path,
@@ -87,168 +252,172 @@ class RuleVisualizer:
                 if len(rules) > 1
             ]
         }
+        return self._execution_summary_cache
     
-    def generate_report(self, filename: str = 'rule_analysis.html') -> None:
-        """Generate comprehensive HTML report."""
-        html_content = self._generate_html_report()
+    def generate_report(self, filename: str = 'rule_analysis.html', include_ast: bool = True,
+                        inline_dot: bool = True) -> None:
+        """Generate comprehensive HTML report.
+        
+        Pass include_ast=False to leave out the per-rule AST sections, which
+        make up most of the page for large rule sets. With inline_dot=False
+        the Graphviz source is saved next to the report (same name, .dot
+        extension) and linked instead of embedded.
+        """
+        dot_href = None
+        if not inline_dot:
+            dot_filename = os.path.splitext(filename)[0] + '.dot'
+            self.export_graphviz(dot_filename)
+            dot_href = os.path.basename(dot_filename)
         
-        with open(filename, 'w') as f:
-            f.write(html_content)
+        with open(filename, 'w', buffering=1 << 16) as f:
+            self._write_html_report(f, include_ast, dot_href)
         
         print(f"Analysis report saved to: {filename}")
     
-    def _generate_html_report(self) -> str:
+    def _generate_html_report(self, include_ast: bool = True) -> str:
         """Generate HTML report content."""
-        execution_summary = self.get_execution_summary()
+        buffer = io.StringIO()
+        self._write_html_report(buffer, include_ast)
+        return buffer.getvalue()
+    
+    def _write_html_report(self, fh: TextIO, include_ast: bool = True,
+                           dot_href: Optional[str] = None) -> None:
+        """Write the HTML report to a text stream, one section at a time.
         
-        html = f"""
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Symbolica Rule Analysis Report</title>
-    <style>
-        body {{ font-family: Arial, sans-serif; margin: 20px; background-color: #f5f5f5; }}
-        .container {{ max-width: 1200px; margin: 0 auto; background-color: white; padding: 20px; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }}
-        h1, h2, h3 {{ color: #333; }}
-        .summary {{ background-color: #e8f4fd; padding: 15px; border-radius: 5px; margin-bottom: 20px; }}
-        .rule-card {{ border: 1px solid #ddd; margin: 10px 0; padding: 15px; border-radius: 5px; background-color: #fafafa; }}
-        .execution-level {{ background-color: #f0f8ff; padding: 10px; margin: 5px 0; border-left: 4px solid #007acc; }}
-        .dependency {{ color: #666; font-style: italic; }}
-        .ast-tree {{ background-color: #f9f9f9; border: 1px solid #ddd; padding: 10px; font-family: monospace; white-space: pre-wrap; }}
-        .stats-grid {{ display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 15px; margin: 20px 0; }}
-        .stat-card {{ background-color: #f8f9fa; padding: 15px; border-radius: 5px; text-align: center; }}
-        .stat-value {{ font-size: 2em; font-weight: bold; color: #007acc; }}
-        .critical-path {{ background-color: #fff3cd; border: 1px solid #ffeaa7; padding: 10px; border-radius: 5px; }}
-        .graphviz-note {{ background-color: #d4edda; border: 1px solid #c3e6cb; padding: 10px; border-radius: 5px; margin: 15px 0; }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <h1>Symbolica Rule Analysis Report</h1>
+        If dot_href is given, the Graphviz section links to that file rather
+        than embedding the DOT source.
+        """
+        execution_summary = self.get_execution_summary()
+        stats = execution_summary['statistics']
         
+        fh.write(_REPORT_HEAD)
+        cards = "\n".join([
+            _STAT_CARD.format(value=format(stats[key], spec), label=label)
+            for key, label, spec in _SUMMARY_STATS
+        ])
+        fh.write(f"""
         <div class="summary">
             <h2>Summary</h2>
             <div class="stats-grid">
-                <div class="stat-card">
-                    <div class="stat-value">{execution_summary['statistics']['total_rules']}</div>
-                    <div>Total Rules</div>
-                </div>
-                <div class="stat-card">
-                    <div class="stat-value">{execution_summary['statistics']['execution_levels']}</div>
-                    <div>Execution Levels</div>
-                </div>
-                <div class="stat-card">
-                    <div class="stat-value">{execution_summary['statistics']['total_dependencies']}</div>
-                    <div>Dependencies</div>
-                </div>
-                <div class="stat-card">
-                    <div class="stat-value">{execution_summary['statistics']['parallelization_potential']:.1f}</div>
-                    <div>Avg Rules/Level</div>
-                </div>
+{cards}
             </div>
         </div>
         
         <h2>Execution Order</h2>
-        {self._generate_execution_order_html(execution_summary['execution_levels'])}
+        """)
+        self._write_execution_order_html(fh, execution_summary['execution_levels'])
+        fh.write("""
         
         <h2>Critical Path Analysis</h2>
         <div class="critical-path">
-            {self._generate_critical_path_html(execution_summary['critical_path'])}
+            """)
+        self._write_critical_path_html(fh, execution_summary['critical_path'])
+        fh.write("""
         </div>
         
         <h2>Rule Details</h2>
-        {self._generate_rule_details_html()}
+        """)
+        self._write_rule_details_html(fh, include_ast)
+        fh.write("""
         
         <h2>Dependency Graph</h2>
-        <div class="graphviz-note">
+        <div class="graphviz-note">""")
+        if dot_href is None:
+            fh.write("""
             <strong>Graphviz Visualization:</strong> To generate a visual dependency graph, save the following DOT content 
             to a .dot file and render with: <code>dot -Tpng filename.dot -o graph.png</code>
-            <pre style="margin-top: 10px; background-color: white; padding: 10px; border: 1px solid #ddd;">{self.dag_viz.to_graphviz()}</pre>
+            <pre style="margin-top: 10px; background-color: white; padding: 10px; border: 1px solid #ddd;">""")
+            fh.write(_escape(self.dag_viz.to_graphviz()))
+            fh.write("</pre>")
+        else:
+            fh.write(f"""
+            <strong>Graphviz Visualization:</strong> The dependency graph is saved as
+            <a href="{html.escape(urllib.parse.quote(dot_href))}">{_escape(dot_href)}</a>; render it with:
+            <code>dot -Tpng {_escape(dot_href)} -o graph.png</code>""")
+        fh.write("""
         </div>
         
         <h2>Parallelization Opportunities</h2>
-        {self._generate_parallelization_html(execution_summary['parallelization_opportunities'])}
-        
-        <div style="margin-top: 30px; padding-top: 20px; border-top: 1px solid #ddd; color: #666; text-align: center;">
-            Generated by Symbolica Rule Visualizer
-        </div>
-    </div>
-</body>
-</html>"""
-        return html
+        """)
+        self._write_parallelization_html(fh, execution_summary['parallelization_opportunities'])
+        fh.write(_REPORT_TAIL)
     
-    def _generate_execution_order_html(self, execution_levels: List[List[str]]) -> str:
-        """Generate HTML for execution order section."""
-        html = ""
+    def _write_execution_order_html(self, fh: TextIO, execution_levels: List[List[str]]) -> None:
+        """Write HTML for execution order section."""
+        deps_display = self._deps_display
+        escaped_ids = self._escaped_ids
         for level, rules in enumerate(execution_levels):
-            html += f'<div class="execution-level">'
-            html += f'<h3>Level {level}</h3>'
+            fh.write(f'<div class="execution-level"><h3>Level {level}</h3>')
             for rule_id in rules:
-                rule = next(r for r in self.rules if r.id == rule_id)
-                deps = self.dag_viz.dependencies.get(rule_id, set())
-                deps_str = f" (depends on: {', '.join(sorted(deps))})" if deps else ""
-                html += f'<div>• {rule_id} [priority: {rule.priority}]{deps_str}</div>'
-            html += '</div>'
-        return html
+                rule = self._rules_by_id[rule_id]
+                deps = deps_display.get(rule_id)
+                deps_str = f" (depends on: {deps})" if deps else ""
+                fh.write(f'<div>• {escaped_ids[rule_id]} [priority: {rule.priority}]{deps_str}</div>')
+            fh.write('</div>')
     
-    def _generate_critical_path_html(self, critical_path: List[str]) -> str:
-        """Generate HTML for critical path section."""
+    def _write_critical_path_html(self, fh: TextIO, critical_path: List[str]) -> None:
+        """Write HTML for critical path section."""
         if not critical_path:
-            return "<p>No dependencies found - all rules are independent</p>"
+            fh.write("<p>No dependencies found - all rules are independent</p>")
+            return
         
-        html = "<p><strong>Longest dependency chain:</strong></p><p>"
-        for i, rule_id in enumerate(critical_path):
-            rule = next(r for r in self.rules if r.id == rule_id)
-            arrow = " → " if i < len(critical_path) - 1 else ""
-            html += f"{rule_id} [priority: {rule.priority}]{arrow}"
-        html += f"</p><p><strong>Chain length:</strong> {len(critical_path)} rules</p>"
-        return html
+        escaped_ids = self._escaped_ids
+        chain = " → ".join(
+            f"{escaped_ids[rule_id]} [priority: {self._rules_by_id[rule_id].priority}]"
+            for rule_id in critical_path
+        )
+        fh.write(
+            f"<p><strong>Longest dependency chain:</strong></p><p>{chain}"
+            f"</p><p><strong>Chain length:</strong> {len(critical_path)} rules</p>"
+        )
     
-    def _generate_rule_details_html(self) -> str:
-        """Generate HTML for rule details section."""
-        html = ""
-        for rule in sorted(self.rules, key=lambda r: r.priority, reverse=True):
-            analysis = self.analyze_rule(rule.id)
-            
-            html += f'<div class="rule-card">'
-            html += f'<h3>{rule.id}</h3>'
-            html += f'<p><strong>Priority:</strong> {rule.priority}</p>'
-            html += f'<p><strong>Condition:</strong> <code>{rule.condition}</code></p>'
-            html += f'<p><strong>Actions:</strong> {len(rule.actions)} action(s)</p>'
+    def _write_rule_details_html(self, fh: TextIO, include_ast: bool = True) -> None:
+        """Write HTML for rule details section, one rule card at a time."""
+        # Only the dependency lists are needed here, not the full analyze_rule()
+        dep_graph = self._get_dep_graph()
+        escaped_ids = self._escaped_ids
+        for rule in self._rules_by_priority:
+            parts = [
+                f'<div class="rule-card"><h3>{escaped_ids[rule.id]}</h3>',
+                f'<p><strong>Priority:</strong> {rule.priority}</p>',
+                f'<p><strong>Condition:</strong> <code>{_escape(rule.condition)}</code></p>',
+                f'<p><strong>Actions:</strong> {len(rule.actions)} action(s)</p>',
+            ]
             
-            if hasattr(rule, 'tags') and rule.tags:
-                html += f'<p><strong>Tags:</strong> {", ".join(rule.tags)}</p>'
+            tags = getattr(rule, 'tags', None)
+            if tags:
+                parts.append(f'<p><strong>Tags:</strong> {_escape(", ".join(tags))}</p>')
             
             # Dependencies
-            deps = analysis['dependencies'].get('dependencies', [])
+            deps = dep_graph.get(rule.id, {}).get('dependencies', [])
             if deps:
-                html += f'<p class="dependency"><strong>Depends on:</strong> {", ".join(deps)}</p>'
+                parts.append(f'<p class="dependency"><strong>Depends on:</strong> {", ".join([escaped_ids[dep] for dep in deps])}</p>')
             
             # AST Tree
-            if analysis['ast']:
-                html += '<details><summary><strong>AST Structure</strong></summary>'
-                html += f'<div class="ast-tree">{self.ast_viz.to_text_tree(analysis["ast"])}</div>'
-                html += '</details>'
+            ast_tree = self.ast_viz.get_ast_tree(rule.id) if include_ast else None
+            if ast_tree is not None:
+                parts.append('<details><summary><strong>AST Structure</strong></summary>')
+                parts.append(f'<div class="ast-tree">{_escape(self.ast_viz.to_text_tree(ast_tree))}</div>')
+                parts.append('</details>')
             
-            html += '</div>'
-        
-        return html
+            parts.append('</div>')
+            fh.write("".join(parts))
     
-    def _generate_parallelization_html(self, opportunities: List[Dict[str, Any]]) -> str:
-        """Generate HTML for parallelization opportunities."""
+    def _write_parallelization_html(self, fh: TextIO, opportunities: List[Dict[str, Any]]) -> None:
+        """Write HTML for parallelization opportunities."""
         if not opportunities:
-            return "<p>No parallelization opportunities found - rules execute sequentially.</p>"
+            fh.write("<p>No parallelization opportunities found - rules execute sequentially.</p>")
+            return
         
-        html = "<p>The following execution levels can run rules in parallel:</p>"
+        fh.write("<p>The following execution levels can run rules in parallel:</p>")
+        level_rules = self._level_rules_display
         for opp in opportunities:
-            html += f'<div class="execution-level">'
-            html += f'<strong>Level {opp["level"]}:</strong> {opp["parallel_rules"]} rules can execute in parallel'
-            html += f'<br>Rules: {", ".join(opp["rules"])}'
-            html += '</div>'
-        
-        return html
+            fh.write(
+                f'<div class="execution-level">'
+                f'<strong>Level {opp["level"]}:</strong> {opp["parallel_rules"]} rules can execute in parallel'
+                f'<br>Rules: {level_rules[opp["level"]]}'
+                '</div>'
+            )
     
     def export_graphviz(self, filename: str = 'rule_dependencies.dot') -> None:
         """Export dependency graph as Graphviz DOT file."""
@@ -274,8 +443,8 @@ class RuleVisualizer:
             }
         }
         
-        with open(filename, 'w') as f:
-            json.dump(data, f, indent=2, default=str)
+        with open(filename, 'wb', buffering=1 << 16) as f:
+            f.write(_dump_json(data))
         
         print(f"Analysis data exported to: {filename}")
     
@@ -297,27 +466,36 @@ class RuleVisualizer:
             print("No dependency chains found")
 
 
+def _visualize_engine(engine, show_ast: bool = True, show_dag: bool = True) -> RuleVisualizer:
+    """Build a visualizer for an engine and print the requested views."""
+    visualizer = RuleVisualizer(engine)
+    
+    if show_ast:
+        visualizer.show_ast()
+    
+    if show_dag:
+        visualizer.show_dag()
+    
+    return visualizer
+
+
 def visualize_from_yaml(yaml_content: str, show_ast: bool = True, show_dag: bool = True) -> RuleVisualizer:
     """Quick function to visualize rules from YAML content."""
     try:
         from symbolica import Engine
-        engine = Engine.from_yaml(yaml_content)
-        visualizer = RuleVisualizer(engine)
-        
-        if show_ast:
-            visualizer.show_ast()
-        
-        if show_dag:
-            visualizer.show_dag()
-        
-        return visualizer
     except ImportError:
         print("Error: Could not import symbolica. Make sure it's in your Python path.")
         return None
+    return _visualize_engine(Engine.from_yaml(yaml_content), show_ast, show_dag)
 
 
 def visualize_from_file(yaml_file: str, **kwargs) -> RuleVisualizer:
     """Quick function to visualize rules from YAML file."""
-    with open(yaml_file, 'r') as f:
-        yaml_content = f.read()
-    return visualize_from_yaml(yaml_content, **kwargs) 
\ No newline at end of file
+    try:
+        from symbolica import Engine
+    except ImportError:
+        print("Error: Could not import symbolica. Make sure it's in your Python path.")
+        return None
+    # Let the engine read the file: unlike from_yaml, from_file does not keep
+    # the whole YAML text alive in its last-call cache afterwards
+    return _visualize_engine(Engine.from_file(yaml_file), **kwargs)